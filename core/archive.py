@@ -0,0 +1,88 @@
+import threading
+from contextlib import contextmanager
+
+from django.db import transaction
+from django.db.models import BooleanField, Value, prefetch_related_objects
+
+from .models import ArchivedTask, Task
+
+_state = threading.local()
+
+TASK_FIELDS = [
+    "id",
+    "title",
+    "description",
+    "completed",
+    "created_by_id",
+    "created_at",
+    "updated_at",
+    "version",
+]
+
+
+def archive_batch(cutoff, batch_size):
+    """
+    Move up to ``batch_size`` tasks completed before ``cutoff`` to the archive.
+
+    Returns the number of tasks moved. Rows are copied and deleted in one
+    transaction. The delete runs inside ``archiving()``, so the receivers only
+    drop cached details: archiving is not a deletion as far as change events
+    and stats are concerned.
+    """
+    with transaction.atomic():
+        tasks = list(
+            Task.objects.filter(completed=True, updated_at__lt=cutoff)
+            .order_by("pk")
+            .select_for_update(skip_locked=True)[:batch_size]
+        )
+        if not tasks:
+            return 0
+        ArchivedTask.objects.bulk_create(
+            ArchivedTask(**{field: getattr(task, field) for field in TASK_FIELDS})
+            for task in tasks
+        )
+        with archiving():
+            Task.objects.filter(pk__in=[task.pk for task in tasks]).delete()
+    return len(tasks)
+
+
+@contextmanager
+def archiving():
+    """Mark Task deletions in this thread as archiving for the receivers"""
+    _state.active = True
+    try:
+        yield
+    finally:
+        _state.active = False
+
+
+def is_archiving():
+    return getattr(_state, "active", False)
+
+
+def tasks_with_archived():
+    """Active and archived tasks as one ``values()`` queryset, newest first"""
+    active = (
+        Task.objects.order_by()
+        .values(*TASK_FIELDS)
+        .annotate(archived=Value(False, output_field=BooleanField()))
+    )
+    archived = (
+        ArchivedTask.objects.order_by()
+        .values(*TASK_FIELDS)
+        .annotate(archived=Value(True, output_field=BooleanField()))
+    )
+    return active.union(archived, all=True).order_by("-created_at", "-id")
+
+
+def load_tasks(rows):
+    """Turn rows of ``tasks_with_archived()`` into Task instances with authors"""
+    tasks = []
+    for row in rows:
+        row = dict(row)
+        archived = row.pop("archived")
+        task = Task(**row)
+        task.archived = archived
+        tasks.append(task)
+    prefetch_related_objects(tasks, "created_by")
+    return tasks
@@ -0,0 +1,28 @@
+from django.utils import timezone
+
+from .models import Task, User
+
+
+def build_tasks(rows):
+    """Build ``rows`` unsaved tasks sharing one author, for timing serializers"""
+    now = timezone.now()
+    user = User(
+        id=1,
+        username="benchmark",
+        email="benchmark@example.com",
+        first_name="Bench",
+        last_name="Mark",
+        created_at=now,
+    )
+    return [
+        Task(
+            id=i,
+            title=f"Task {i}",
+            description="Lorem ipsum dolor sit amet " * 4,
+            completed=i % 2 == 0,
+            created_by=user,
+            created_at=now,
+            updated_at=now,
+        )
+        for i in range(1, rows + 1)
+    ]
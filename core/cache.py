@@ -0,0 +1,125 @@
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+
+_MISSING = object()
+_tiered_cache = None
+_tiered_cache_lock = threading.Lock()
+
+
+class TieredCache:
+    """
+    Bounded per-process LRU in front of a shared Django cache.
+
+    Keys live in namespaces whose version is stored in the shared cache.
+    Invalidating a namespace bumps that version, which every process picks up
+    the next time its local copy of the version expires (after ``local_ttl``
+    seconds), so hot keys are served from process memory with no I/O and are
+    at most ``local_ttl`` seconds stale in other processes.
+    """
+
+    def __init__(self, alias="default", max_entries=1000, local_ttl=2, timeout=300):
+        self.shared = caches[alias]
+        self.max_entries = max_entries
+        self.local_ttl = local_ttl
+        self.timeout = timeout
+        self._local = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {
+            "local": {"hits": 0, "misses": 0},
+            "shared": {"hits": 0, "misses": 0},
+        }
+
+    def _local_get(self, key):
+        with self._lock:
+            entry = self._local.get(key)
+            if entry is None:
+                return _MISSING
+            value, expires_at = entry
+            if expires_at <= time.monotonic():
+                del self._local[key]
+                return _MISSING
+            self._local.move_to_end(key)
+            return value
+
+    def _local_set(self, key, value):
+        with self._lock:
+            self._local[key] = (value, time.monotonic() + self.local_ttl)
+            self._local.move_to_end(key)
+            while len(self._local) > self.max_entries:
+                self._local.popitem(last=False)
+
+    def get_version(self, namespace):
+        version = self._local_get(("version", namespace))
+        if version is _MISSING:
+            version_key = f"{namespace}:version"
+            version = self.shared.get(version_key)
+            if version is None:
+                # Start from the clock rather than 1 so a version key evicted
+                # from the shared cache never revives entries of an older one.
+                self.shared.add(version_key, time.time_ns(), None)
+                version = self.shared.get(version_key)
+            self._local_set(("version", namespace), version)
+        return version
+
+    def get_or_set(self, namespace, key, default):
+        """Return the cached value for ``key``, computing it with ``default()``"""
+        full_key = f"{namespace}:{self.get_version(namespace)}:{key}"
+
+        value = self._local_get(full_key)
+        if value is not _MISSING:
+            self.stats["local"]["hits"] += 1
+            return value
+        self.stats["local"]["misses"] += 1
+
+        value = self.shared.get(full_key, _MISSING)
+        if value is _MISSING:
+            self.stats["shared"]["misses"] += 1
+            value = default()
+            self.shared.set(full_key, value, self.timeout)
+        else:
+            self.stats["shared"]["hits"] += 1
+        self._local_set(full_key, value)
+        return value
+
+    def invalidate(self, namespace):
+        """Bump the namespace version now and again when the transaction commits"""
+        self._bump(namespace)
+        # The second bump discards values cached from pre-commit data by
+        # requests that ran between the first bump and the commit.
+        transaction.on_commit(lambda: self._bump(namespace))
+
+    def _bump(self, namespace):
+        version_key = f"{namespace}:version"
+        try:
+            version = self.shared.incr(version_key)
+        except ValueError:
+            version = time.time_ns()
+            self.shared.set(version_key, version, None)
+        self._local_set(("version", namespace), version)
+
+    def clear(self):
+        """Drop the local tier and reset the metrics"""
+        with self._lock:
+            self._local.clear()
+        for tier in self.stats.values():
+            tier.update(hits=0, misses=0)
+
+
+def get_tiered_cache():
+    """Return the process-wide cache configured by the TIERED_CACHE setting"""
+    global _tiered_cache
+    with _tiered_cache_lock:
+        if _tiered_cache is None:
+            config = getattr(settings, "TIERED_CACHE", {})
+            _tiered_cache = TieredCache(
+                alias=config.get("ALIAS", "default"),
+                max_entries=config.get("MAX_ENTRIES", 1000),
+                local_ttl=config.get("LOCAL_TTL", 2),
+                timeout=config.get("TIMEOUT", 300),
+            )
+        return _tiered_cache
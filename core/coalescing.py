@@ -0,0 +1,213 @@
+import logging
+import threading
+import time
+
+from django.conf import settings
+from django.db import close_old_connections, transaction
+from django.db.models import BooleanField, Case, F, Q, Value, When
+from django.utils import timezone
+
+from .models import Task
+from .signals import task_updated
+
+logger = logging.getLogger(__name__)
+
+_coalescer = None
+_coalescer_lock = threading.Lock()
+
+UPDATED = "updated"
+UNCHANGED = "unchanged"
+MISSING = "missing"
+CONFLICT = "conflict"
+DROPPED = "dropped"
+PENDING = "pending"
+
+
+class PendingToggle:
+    def __init__(self, pk, version, completed):
+        self.pk = pk
+        self.version = version
+        self.completed = completed
+        self.done = threading.Event()
+        self.outcome = None
+        self.new_version = None
+        self.error = None
+
+
+class ToggleCoalescer:
+    """
+    Write-behind buffer for ``completed`` toggles.
+
+    A background flusher thread waits for the first queued toggle, lets more
+    join for ``window`` seconds (or until ``max_batch`` are queued), then
+    writes the batch with one conditional ``CASE`` UPDATE per round of
+    distinct tasks, in a single transaction. Callers block until the
+    transaction holding their toggle has committed.
+
+    Batching only helps when one process runs several request threads at once
+    (gthread workers). Under ASGI, sync views share one thread, so batches
+    could never form; the view writes toggles directly there instead.
+    """
+
+    def __init__(self, window=0.005, max_batch=500, timeout=5):
+        self.window = window
+        self.max_batch = max_batch
+        self.timeout = timeout
+        self._pending = []
+        self._cond = threading.Condition()
+        self._thread = None
+        self.stats = {
+            "flushes": 0,
+            "toggles": 0,
+            "dropped": 0,
+            "last_flush_size": 0,
+            "max_flush_size": 0,
+            "last_flush_ms": 0.0,
+            "total_flush_ms": 0.0,
+        }
+
+    def submit(self, pk, version, completed):
+        """
+        Queue a toggle and wait for its flush.
+
+        Returns ``(outcome, version)`` where outcome is one of UPDATED,
+        UNCHANGED, MISSING, CONFLICT, DROPPED when the toggle was still queued
+        after ``timeout`` and was withdrawn without being written, or PENDING
+        when its flush is still running after another ``timeout``.
+        """
+        toggle = PendingToggle(int(pk), version, completed)
+        with self._cond:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(
+                    target=self._run, name="toggle-coalescer", daemon=True
+                )
+                self._thread.start()
+            self._pending.append(toggle)
+            self._cond.notify()
+
+        if not toggle.done.wait(self.timeout):
+            with self._cond:
+                if toggle in self._pending:
+                    self._pending.remove(toggle)
+                    self.stats["dropped"] += 1
+                    return DROPPED, None
+            # Already part of a running flush: report what it actually did,
+            # or PENDING if that flush is stuck
+            if not toggle.done.wait(self.timeout):
+                return PENDING, None
+
+        if toggle.error is not None:
+            raise toggle.error
+        return toggle.outcome, toggle.new_version
+
+    def _run(self):
+        while True:
+            with self._cond:
+                self._cond.wait_for(lambda: self._pending)
+                self._cond.wait_for(
+                    lambda: len(self._pending) >= self.max_batch, self.window
+                )
+                batch = self._pending[: self.max_batch]
+                del self._pending[: self.max_batch]
+            if batch:
+                self._flush(batch)
+
+    def _flush(self, batch):
+        started = time.perf_counter()
+        try:
+            # Same connection housekeeping as a request: honour CONN_MAX_AGE
+            close_old_connections()
+            with transaction.atomic():
+                for batch_round in self._rounds(batch):
+                    self._write(batch_round)
+        except Exception as exc:
+            logger.exception("Flushing %d toggles failed", len(batch))
+            for toggle in batch:
+                toggle.error = exc
+        finally:
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            self._record(len(batch), elapsed_ms)
+            for toggle in batch:
+                toggle.done.set()
+            try:
+                close_old_connections()
+            except Exception:
+                logger.exception("Closing the flusher's connection failed")
+
+    def _rounds(self, batch):
+        """Split the batch so each task appears at most once per UPDATE"""
+        rounds = []
+        for toggle in batch:
+            for batch_round in rounds:
+                if toggle.pk not in batch_round:
+                    batch_round[toggle.pk] = toggle
+                    break
+            else:
+                rounds.append({toggle.pk: toggle})
+        return [list(batch_round.values()) for batch_round in rounds]
+
+    def _write(self, toggles):
+        now = timezone.now()
+        condition = Q()
+        for toggle in toggles:
+            condition |= Q(pk=toggle.pk, version=toggle.version) & ~Q(
+                completed=toggle.completed
+            )
+        Task.objects.filter(condition).update(
+            completed=Case(
+                *[When(pk=t.pk, then=Value(t.completed)) for t in toggles],
+                output_field=BooleanField(),
+            ),
+            version=F("version") + 1,
+            updated_at=now,
+        )
+
+        rows = {
+            pk: (version, completed, updated_at)
+            for pk, version, completed, updated_at in Task.objects.filter(
+                pk__in=[t.pk for t in toggles]
+            ).values_list("pk", "version", "completed", "updated_at")
+        }
+        for toggle in toggles:
+            row = rows.get(toggle.pk)
+            if row is None:
+                toggle.outcome = MISSING
+            elif row == (toggle.version + 1, toggle.completed, now):
+                toggle.outcome, toggle.new_version = UPDATED, toggle.version + 1
+                task_updated.send(
+                    sender=Task,
+                    pk=toggle.pk,
+                    values={
+                        "completed": toggle.completed,
+                        "updated_at": now,
+                        "version": toggle.new_version,
+                    },
+                )
+            elif row[:2] == (toggle.version, toggle.completed):
+                toggle.outcome, toggle.new_version = UNCHANGED, toggle.version
+            else:
+                toggle.outcome = CONFLICT
+
+    def _record(self, size, elapsed_ms):
+        stats = self.stats
+        stats["flushes"] += 1
+        stats["toggles"] += size
+        stats["last_flush_size"] = size
+        stats["max_flush_size"] = max(stats["max_flush_size"], size)
+        stats["last_flush_ms"] = elapsed_ms
+        stats["total_flush_ms"] += elapsed_ms
+        logger.debug("Flushed %d toggles in %.1f ms", size, elapsed_ms)
+
+
+def get_coalescer():
+    """Return the process-wide coalescer configured by WRITE_COALESCING"""
+    global _coalescer
+    with _coalescer_lock:
+        if _coalescer is None:
+            config = getattr(settings, "WRITE_COALESCING", {})
+            _coalescer = ToggleCoalescer(
+                window=config.get("WINDOW_MS", 5) / 1000,
+                max_batch=config.get("MAX_BATCH", 500),
+                timeout=config.get("TIMEOUT", 5),
+            )
+        return _coalescer
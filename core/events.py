@@ -0,0 +1,149 @@
+import asyncio
+import json
+import threading
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from django.utils.module_loading import import_string
+
+_broker = None
+_broker_lock = threading.Lock()
+
+
+def _offer(queue, event):
+    try:
+        queue.put_nowait(event)
+    except asyncio.QueueFull:
+        # A stalled client drops events; it can catch up via the delta sync
+        # endpoint when it reconnects.
+        pass
+
+
+class Subscription:
+    """Queue of events delivered to one subscriber on its event loop"""
+
+    def __init__(self, broker, max_size):
+        self.broker = broker
+        self.loop = asyncio.get_running_loop()
+        self.queue = asyncio.Queue(max_size)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.broker.unsubscribe(self)
+
+    async def get(self, timeout=None):
+        """Return the next event, or None if none arrives within ``timeout``"""
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+
+class LocalBroker:
+    """
+    In-process broadcaster.
+
+    Every subscriber in this process receives every event published in it.
+    Enough for a single worker, and the stand-in used by the tests.
+    """
+
+    def __init__(self, max_queue_size=100):
+        self.max_queue_size = max_queue_size
+        self._subscribers = set()
+        self._lock = threading.Lock()
+
+    def publish(self, event):
+        self.dispatch(event)
+
+    def dispatch(self, event):
+        """Hand ``event`` to the subscribers of this process"""
+        with self._lock:
+            subscribers = list(self._subscribers)
+        for subscription in subscribers:
+            subscription.loop.call_soon_threadsafe(_offer, subscription.queue, event)
+
+    def subscribe(self):
+        """Subscribe the running event loop; use as a context manager"""
+        subscription = Subscription(self, self.max_queue_size)
+        with self._lock:
+            self._subscribers.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            self._subscribers.discard(subscription)
+
+
+class RedisBroker(LocalBroker):
+    """
+    Broadcaster shared by several workers through Redis pub/sub.
+
+    Each process keeps one background listener thread that forwards messages
+    from the channel to its local subscribers.
+    """
+
+    def __init__(
+        self, url="redis://localhost:6379/0", channel="core:task-events", **options
+    ):
+        import redis
+
+        super().__init__(**options)
+        self.channel = channel
+        self._redis = redis.Redis.from_url(url)
+        self._listener = None
+
+    def publish(self, event):
+        self._redis.publish(self.channel, json.dumps(event, cls=DjangoJSONEncoder))
+
+    def subscribe(self):
+        with self._lock:
+            if self._listener is None:
+                pubsub = self._redis.pubsub(ignore_subscribe_messages=True)
+                pubsub.subscribe(**{self.channel: self._on_message})
+                self._listener = pubsub.run_in_thread(sleep_time=1, daemon=True)
+        return super().subscribe()
+
+    def _on_message(self, message):
+        self.dispatch(json.loads(message["data"]))
+
+
+def get_broker():
+    """Return the broker configured by the TASK_EVENTS setting"""
+    global _broker
+    with _broker_lock:
+        if _broker is None:
+            config = getattr(settings, "TASK_EVENTS", {})
+            backend = import_string(config.get("BACKEND", "core.events.LocalBroker"))
+            _broker = backend(**config.get("OPTIONS", {}))
+        return _broker
+
+
+def publish(event_type, task, stats=None):
+    """Publish a task event once the current transaction commits"""
+    event = {"type": event_type, "task": task, "stats": stats or {}}
+    # robust: the write has committed, so a broker outage must not fail the
+    # request; the error is logged and clients catch up via delta sync.
+    transaction.on_commit(lambda: get_broker().publish(event), robust=True)
+
+
+def format_event(event_type, data):
+    payload = json.dumps(data, cls=DjangoJSONEncoder)
+    return f"event: {event_type}\ndata: {payload}\n\n"
+
+
+async def event_stream():
+    """Yield Server-Sent Events for task changes, with periodic heartbeats"""
+    heartbeat = getattr(settings, "TASK_EVENTS", {}).get("HEARTBEAT", 15)
+    with get_broker().subscribe() as subscription:
+        yield ": connected\n\n"
+        while True:
+            event = await subscription.get(timeout=heartbeat)
+            if event is None:
+                yield ": heartbeat\n\n"
+                continue
+            yield format_event(event["type"], event["task"])
+            if any(event["stats"].values()):
+                yield format_event("stats", event["stats"])
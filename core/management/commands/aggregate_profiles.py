@@ -0,0 +1,70 @@
+import statistics
+from collections import Counter, defaultdict
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from core.profiling import load_profiles
+
+
+class Command(BaseCommand):
+    help = "Summarise stored request profiles by URL name"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--directory",
+            default=str(settings.PROFILING.get("DIRECTORY", "profiles")),
+            help="Directory written by ProfilingMiddleware",
+        )
+        parser.add_argument("--url-name", help="Only include this URL name")
+        parser.add_argument(
+            "--output",
+            help="Write merged collapsed stacks per URL name (.folded) here",
+        )
+        parser.add_argument("--top-queries", type=int, default=3)
+
+    def handle(self, *args, **options):
+        groups = defaultdict(list)
+        for profile in load_profiles(options["directory"]):
+            url_name = profile["url_name"] or "<unresolved>"
+            if options["url_name"] in (None, url_name):
+                groups[url_name].append(profile)
+
+        if not groups:
+            self.stdout.write("No profiles found.")
+            return
+
+        for url_name, profiles in sorted(groups.items()):
+            self.summarise(url_name, profiles, options["top_queries"])
+            if options["output"]:
+                self.write_folded(url_name, profiles, Path(options["output"]))
+
+    def summarise(self, url_name, profiles, top_queries):
+        durations = sorted(profile["duration_ms"] for profile in profiles)
+        query_counts = [len(profile["queries"]) for profile in profiles]
+        p95 = durations[min(len(durations) - 1, int(len(durations) * 0.95))]
+        self.stdout.write(
+            f"{url_name}: {len(profiles)} profiles, "
+            f"p50 {statistics.median(durations):.1f} ms, p95 {p95:.1f} ms, "
+            f"max {durations[-1]:.1f} ms, "
+            f"{statistics.mean(query_counts):.1f} queries/request"
+        )
+
+        sql_time = Counter()
+        for profile in profiles:
+            for query in profile["queries"]:
+                sql_time[query["sql"]] += query["duration_ms"]
+        for sql, total_ms in sql_time.most_common(top_queries):
+            self.stdout.write(f"  {total_ms:8.1f} ms  {sql[:120]}")
+
+    def write_folded(self, url_name, profiles, output):
+        stacks = Counter()
+        for profile in profiles:
+            stacks.update(profile["stacks"])
+        output.mkdir(parents=True, exist_ok=True)
+        path = output / f"{url_name.replace(':', '_')}.folded"
+        path.write_text(
+            "".join(f"{stack} {count}\n" for stack, count in stacks.items())
+        )
+        self.stdout.write(f"  stacks written to {path}")
@@ -0,0 +1,32 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from core.archive import archive_batch
+
+
+class Command(BaseCommand):
+    help = "Move old completed tasks from the hot table into the archive"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--days",
+            type=int,
+            default=settings.TASK_ARCHIVE["AFTER_DAYS"],
+            help="Archive tasks completed and not updated for this many days",
+        )
+        parser.add_argument(
+            "--batch-size", type=int, default=settings.TASK_ARCHIVE["BATCH_SIZE"]
+        )
+
+    def handle(self, *args, **options):
+        cutoff = timezone.now() - timedelta(days=options["days"])
+        total = 0
+        while True:
+            moved = archive_batch(cutoff, options["batch_size"])
+            total += moved
+            if moved < options["batch_size"]:
+                break
+        self.stdout.write(self.style.SUCCESS(f"Archived {total} tasks"))
@@ -0,0 +1,43 @@
+import timeit
+
+from django.core.management.base import BaseCommand
+
+from rest_framework.renderers import JSONRenderer
+
+from core.benchmarks import build_tasks
+from core.renderers import MessagePackRenderer, ORJSONRenderer
+from core.serializers import TaskSerializer
+
+
+class Command(BaseCommand):
+    help = "Compare encode time and payload size of the API renderers"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rows", type=int, default=100)
+        parser.add_argument("--iterations", type=int, default=200)
+
+    def handle(self, *args, **options):
+        page = self.build_page(options["rows"])
+        renderers = [JSONRenderer(), ORJSONRenderer(), MessagePackRenderer()]
+
+        self.stdout.write(f"{options['rows']} rows, {options['iterations']} iterations")
+        self.stdout.write(f"{'renderer':<24}{'ms/render':>12}{'bytes':>10}")
+        for renderer in renderers:
+            payload = renderer.render(page)
+            seconds = timeit.timeit(
+                lambda: renderer.render(page), number=options["iterations"]
+            )
+            self.stdout.write(
+                f"{type(renderer).__name__:<24}"
+                f"{seconds * 1000 / options['iterations']:>12.3f}"
+                f"{len(payload):>10}"
+            )
+
+    def build_page(self, rows):
+        """Build a paginated task page without touching the database"""
+        return {
+            "count": rows,
+            "next": None,
+            "previous": None,
+            "results": TaskSerializer(build_tasks(rows), many=True).data,
+        }
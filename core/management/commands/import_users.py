@@ -0,0 +1,36 @@
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+
+from core.user_import import import_users, parse_rows
+
+
+class Command(BaseCommand):
+    help = "Create users in bulk from a CSV or NDJSON file"
+
+    def add_arguments(self, parser):
+        parser.add_argument("path")
+        parser.add_argument(
+            "--format",
+            choices=["csv", "ndjson"],
+            help="Defaults to the file extension",
+        )
+        parser.add_argument("--workers", type=int, help="Password hashing processes")
+
+    def handle(self, *args, **options):
+        path = Path(options["path"])
+        fmt = options["format"] or path.suffix.lstrip(".").lower()
+        if fmt == "jsonl":
+            fmt = "ndjson"
+        if fmt not in ("csv", "ndjson"):
+            raise CommandError("Use a .csv or .ndjson file, or pass --format")
+
+        try:
+            data = path.read_text(encoding="utf-8-sig")
+        except UnicodeDecodeError as exc:
+            raise CommandError(f"{path} is not UTF-8 encoded - {exc}")
+
+        result = import_users(parse_rows(data, fmt), workers=options["workers"])
+        for error in result["errors"]:
+            self.stderr.write(f"Row {error['row']}: {error['errors']}")
+        self.stdout.write(self.style.SUCCESS(f"Created {result['created']} users"))
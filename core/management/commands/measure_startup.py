@@ -0,0 +1,112 @@
+import os
+import subprocess
+import sys
+import time
+import urllib.request
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+GUNICORN_CONF = Path(settings.BASE_DIR) / "django_api_boilerplate" / "gunicorn_conf.py"
+
+
+class Command(BaseCommand):
+    help = "Measure gunicorn cold start time and per-worker memory (Linux only)"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--workers", type=int, default=3)
+        parser.add_argument("--port", type=int, default=8765)
+        parser.add_argument("--timeout", type=float, default=60)
+
+    def handle(self, *args, **options):
+        if not Path("/proc/self/smaps_rollup").exists():
+            raise CommandError("Memory measurement needs Linux /proc/*/smaps_rollup")
+
+        for preload in ["0", "1"]:
+            self.measure(preload, options)
+
+    def measure(self, preload, options):
+        env = {
+            **os.environ,
+            "GUNICORN_BIND": f"127.0.0.1:{options['port']}",
+            "GUNICORN_WORKERS": str(options["workers"]),
+            "GUNICORN_PRELOAD": preload,
+        }
+        started = time.monotonic()
+        master = subprocess.Popen(
+            [sys.executable, "-m", "gunicorn", "-c", str(GUNICORN_CONF)],
+            cwd=settings.BASE_DIR,
+            env=env,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+        try:
+            self.wait_until_healthy(options, started)
+            cold_start = time.monotonic() - started
+            workers = self.wait_for_workers(master.pid, options)
+            # Let every worker finish importing the app before sampling memory
+            for _ in range(options["workers"] * 2):
+                self.get_health(options)
+
+            self.stdout.write(
+                f"preload={preload}: cold start {cold_start * 1000:.0f} ms"
+            )
+            for pid in [master.pid, *workers]:
+                memory = self.read_memory(pid)
+                role = "master" if pid == master.pid else "worker"
+                self.stdout.write(
+                    f"  {role:<6} pid={pid:<7} rss={memory['Rss'] / 1024:6.1f} MiB"
+                    f"  pss={memory['Pss'] / 1024:6.1f} MiB"
+                    f"  private={memory['Private'] / 1024:6.1f} MiB"
+                )
+        finally:
+            master.terminate()
+            master.wait()
+
+    def get_health(self, options):
+        url = f"http://127.0.0.1:{options['port']}{settings.HEALTHCHECK_PATH}"
+        with urllib.request.urlopen(url, timeout=5) as response:  # nosec B310
+            return response.status
+
+    def wait_until_healthy(self, options, started):
+        while time.monotonic() - started < options["timeout"]:
+            try:
+                if self.get_health(options) == 200:
+                    return
+            except OSError:
+                time.sleep(0.02)
+        raise CommandError("gunicorn did not become healthy in time")
+
+    def wait_for_workers(self, master_pid, options):
+        deadline = time.monotonic() + options["timeout"]
+        while time.monotonic() < deadline:
+            workers = [
+                int(pid)
+                for pid in os.listdir("/proc")
+                if pid.isdigit() and self.parent_pid(pid) == master_pid
+            ]
+            if len(workers) >= options["workers"]:
+                return sorted(workers)
+            time.sleep(0.05)
+        raise CommandError("gunicorn did not start all workers in time")
+
+    def parent_pid(self, pid):
+        try:
+            stat = Path(f"/proc/{pid}/stat").read_text()
+        except OSError:
+            return None
+        # The command name may contain spaces; fields resume after its ")"
+        return int(stat.rsplit(")", 1)[1].split()[1])
+
+    def read_memory(self, pid):
+        """Return Rss, Pss and Private (clean + dirty) sizes in KiB"""
+        memory = {"Private": 0}
+        for line in Path(f"/proc/{pid}/smaps_rollup").read_text().splitlines()[1:]:
+            key, value = line.split(":", 1)
+            size = int(value.split()[0])
+            if key in ("Rss", "Pss"):
+                memory[key] = size
+            elif key.startswith("Private_"):
+                memory["Private"] += size
+        return memory
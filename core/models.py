@@ -1,5 +1,9 @@
 from django.contrib.auth.models import AbstractUser
-from django.db import models
+from django.db import models, router, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .signals import task_updated
 
 
 class User(AbstractUser):
@@ -18,6 +22,28 @@ class User(AbstractUser):
         return self.username
 
 
+class TaskQuerySet(models.QuerySet):
+    def update_versioned(self, pk, version, **values):
+        """
+        Write ``values`` to task ``pk`` only if it is still at ``version``.
+
+        Issues a single ``UPDATE ... WHERE id = ? AND version = ?`` that also
+        bumps the version and ``updated_at``. Returns the new version, or
+        ``None`` if the task is gone or another writer got there first.
+        Callers must only pass values that differ from the stored row.
+        """
+        values.setdefault("updated_at", timezone.now())
+        updated = self.filter(pk=pk, version=version).update(
+            **values, version=F("version") + 1
+        )
+        if not updated:
+            return None
+        task_updated.send(
+            sender=self.model, pk=pk, values={**values, "version": version + 1}
+        )
+        return version + 1
+
+
 class Task(models.Model):
     title = models.CharField(max_length=200)
     description = models.TextField(blank=True)
@@ -25,6 +51,83 @@ class Task(models.Model):
     created_by = models.ForeignKey(User, on_delete=models.CASCADE, related_name="tasks")
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
+    version = models.PositiveIntegerField(default=1)
+
+    objects = TaskQuerySet.as_manager()
+
+    class Meta:
+        ordering = ["-created_at"]
+        indexes = [models.Index(fields=["updated_at", "id"])]
+
+    def __str__(self):
+        return self.title
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remember the stored state so change events can report stats deltas
+        instance._loaded_completed = instance.__dict__.get("completed")
+        return instance
+
+    def save(self, *args, **kwargs):
+        if self._state.adding:
+            return super().save(*args, **kwargs)
+        if kwargs.get("update_fields") is not None:
+            kwargs["update_fields"] = {*kwargs["update_fields"], "version"}
+        using = kwargs.get("using") or router.db_for_write(Task, instance=self)
+        tasks = Task.objects.using(using).filter(pk=self.pk)
+        with transaction.atomic(using=using):
+            # Bump in the database first: the UPDATE locks the row until
+            # commit, so concurrent saves each get their own version.
+            if tasks.update(version=F("version") + 1):
+                self.version = tasks.values_list("version", flat=True).get()
+            super().save(*args, **kwargs)
+
+    def save_changed(self, fields):
+        """
+        Write only ``fields``, guarded by the version this instance was read at.
+
+        Returns ``False`` without writing if the row changed since it was read.
+        """
+        values = {field: getattr(self, field) for field in fields}
+        values["updated_at"] = timezone.now()
+        version = Task.objects.update_versioned(self.pk, self.version, **values)
+        if version is None:
+            return False
+        self.version = version
+        self.updated_at = values["updated_at"]
+        self._loaded_completed = self.completed
+        return True
+
+
+class TaskTombstone(models.Model):
+    """Record of a deleted task, read by the delta sync endpoint"""
+
+    task_id = models.BigIntegerField()
+    deleted_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ["deleted_at", "id"]
+        indexes = [models.Index(fields=["deleted_at", "id"])]
+
+    def __str__(self):
+        return f"Task {self.task_id} deleted at {self.deleted_at}"
+
+
+class ArchivedTask(models.Model):
+    """Completed task moved out of the hot table by ``manage.py archive_tasks``"""
+
+    id = models.BigIntegerField(primary_key=True)
+    title = models.CharField(max_length=200)
+    description = models.TextField(blank=True)
+    completed = models.BooleanField(default=True)
+    created_by = models.ForeignKey(
+        User, on_delete=models.CASCADE, related_name="archived_tasks"
+    )
+    created_at = models.DateTimeField()
+    updated_at = models.DateTimeField()
+    version = models.PositiveIntegerField(default=1)
+    archived_at = models.DateTimeField(auto_now_add=True)
 
     class Meta:
         ordering = ["-created_at"]
@@ -0,0 +1,35 @@
+import msgpack
+import orjson
+from rest_framework import parsers
+from rest_framework.exceptions import ParseError
+
+from .renderers import MessagePackRenderer, ORJSONRenderer
+
+
+class ORJSONParser(parsers.JSONParser):
+    """
+    Parses JSON-serialized data using orjson.
+    """
+
+    renderer_class = ORJSONRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        try:
+            return orjson.loads(stream.read())
+        except orjson.JSONDecodeError as exc:
+            raise ParseError(f"JSON parse error - {exc}")
+
+
+class MessagePackParser(parsers.BaseParser):
+    """
+    Parses MessagePack-serialized data.
+    """
+
+    media_type = "application/msgpack"
+    renderer_class = MessagePackRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        try:
+            return msgpack.unpackb(stream.read(), raw=False)
+        except ValueError as exc:
+            raise ParseError(f"MessagePack parse error - {exc}")
@@ -0,0 +1,163 @@
+import json
+import random
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+from pathlib import Path
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connection
+from django.utils import timezone
+
+_sampler = None
+_sampler_lock = threading.Lock()
+
+
+def sample_stack(frame):
+    """Return a frame and its callers as raw ``(file, line, name)`` tuples"""
+    stack = []
+    while frame is not None:
+        code = frame.f_code
+        stack.append((code.co_filename, code.co_firstlineno, code.co_name))
+        frame = frame.f_back
+    return tuple(stack)
+
+
+def collapse_stack(stack):
+    """Render a sampled stack as one ``root;...;leaf`` line"""
+    return ";".join(
+        f"{name} ({filename}:{lineno})" for filename, lineno, name in reversed(stack)
+    )
+
+
+class StackSampler:
+    """
+    Wall-clock sampling profiler shared by every request in the process.
+
+    A single daemon thread wakes up every ``interval`` seconds and records the
+    current stack of each thread that is serving a profiled request, so the
+    cost per request is a dictionary insert rather than a tracing hook. Stacks
+    are kept as raw code tuples and only formatted for requests that are
+    stored.
+    """
+
+    def __init__(self, interval):
+        self.interval = interval
+        self._stacks = {}
+        self._lock = threading.Lock()
+        self._busy = threading.Event()
+        self._thread = None
+
+    def start(self, ident):
+        with self._lock:
+            self._stacks[ident] = Counter()
+            self._busy.set()
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name="stack-sampler", daemon=True
+                )
+                self._thread.start()
+
+    def stop(self, ident):
+        """Stop sampling ``ident`` and return its collapsed stack counts"""
+        with self._lock:
+            return self._stacks.pop(ident, Counter())
+
+    def _run(self):
+        while True:
+            # Sleep without polling while no request is being profiled
+            self._busy.wait()
+            time.sleep(self.interval)
+            with self._lock:
+                if not self._stacks:
+                    self._busy.clear()
+                    continue
+                frames = sys._current_frames()
+                for ident, stacks in self._stacks.items():
+                    frame = frames.get(ident)
+                    if frame is not None:
+                        stacks[sample_stack(frame)] += 1
+
+
+def get_sampler(interval):
+    """Return the process-wide sampler, creating it on first use"""
+    global _sampler
+    with _sampler_lock:
+        if _sampler is None:
+            _sampler = StackSampler(interval)
+        return _sampler
+
+
+class QueryRecorder:
+    """Database execute wrapper that records each statement and its duration"""
+
+    def __init__(self):
+        self.queries = []
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            duration = time.perf_counter() - started
+            self.queries.append({"sql": sql, "duration_ms": duration * 1000})
+
+
+class ProfilingMiddleware:
+    """
+    Store collapsed stacks and SQL for a sample of requests, plus every request
+    slower than SLOW_THRESHOLD_MS. Disabled unless PROFILING["ENABLED"] is set.
+    """
+
+    def __init__(self, get_response):
+        config = getattr(settings, "PROFILING", {})
+        if not config.get("ENABLED"):
+            raise MiddlewareNotUsed()
+        self.get_response = get_response
+        self.sample_rate = config.get("SAMPLE_RATE", 0.01)
+        self.slow_threshold_ms = config.get("SLOW_THRESHOLD_MS", 500)
+        self.directory = Path(config.get("DIRECTORY", settings.BASE_DIR / "profiles"))
+        self.sampler = get_sampler(config.get("INTERVAL", 0.005))
+
+    def __call__(self, request):
+        sampled = random.random() < self.sample_rate  # nosec B311
+        recorder = QueryRecorder()
+        ident = threading.get_ident()
+
+        self.sampler.start(ident)
+        started = time.perf_counter()
+        try:
+            with connection.execute_wrapper(recorder):
+                response = self.get_response(request)
+        finally:
+            stacks = self.sampler.stop(ident)
+        duration_ms = (time.perf_counter() - started) * 1000
+
+        if sampled or duration_ms >= self.slow_threshold_ms:
+            self.store(request, response, duration_ms, stacks, recorder.queries)
+        return response
+
+    def store(self, request, response, duration_ms, stacks, queries):
+        match = request.resolver_match
+        profile = {
+            "url_name": match.view_name if match else None,
+            "method": request.method,
+            "path": request.path,
+            "status": response.status_code,
+            "duration_ms": duration_ms,
+            "recorded_at": timezone.now().isoformat(),
+            "stacks": {collapse_stack(stack): count for stack, count in stacks.items()},
+            "queries": queries,
+        }
+        self.directory.mkdir(parents=True, exist_ok=True)
+        path = self.directory / f"{time.time_ns()}-{uuid.uuid4().hex[:8]}.json"
+        path.write_text(json.dumps(profile))
+
+
+def load_profiles(directory):
+    """Yield the profiles stored by ProfilingMiddleware in ``directory``"""
+    for path in sorted(Path(directory).glob("*.json")):
+        yield json.loads(path.read_text())
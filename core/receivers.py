@@ -0,0 +1,85 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from . import events
+from .archive import is_archiving
+from .cache import get_tiered_cache
+from .models import Task, TaskTombstone, User
+from .signals import task_updated
+
+
+def task_payload(task):
+    """Flat task representation that needs no extra queries"""
+    return {
+        "id": task.pk,
+        "title": task.title,
+        "description": task.description,
+        "completed": task.completed,
+        "created_by": task.created_by_id,
+        "created_at": task.created_at,
+        "updated_at": task.updated_at,
+        "version": task.version,
+    }
+
+
+def invalidate_task(pk, counts):
+    cache = get_tiered_cache()
+    cache.invalidate(f"task:{pk}")
+    if counts:
+        cache.invalidate("counts")
+
+
+@receiver(post_save, sender=Task)
+def task_saved(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    if created:
+        stats = {"total_tasks": 1, "completed_tasks": int(instance.completed)}
+    else:
+        loaded = getattr(instance, "_loaded_completed", None)
+        if loaded is None:
+            loaded = instance.completed
+        stats = {"completed_tasks": int(instance.completed) - int(loaded)}
+    instance._loaded_completed = instance.completed
+    invalidate_task(instance.pk, counts=created or stats["completed_tasks"])
+    events.publish(
+        "task.created" if created else "task.updated", task_payload(instance), stats
+    )
+
+
+@receiver(task_updated, sender=Task)
+def task_fields_updated(sender, pk, values, **kwargs):
+    stats = {}
+    if "completed" in values:
+        stats["completed_tasks"] = 1 if values["completed"] else -1
+    invalidate_task(pk, counts="completed" in values)
+    events.publish("task.updated", {"id": pk, **values}, stats)
+
+
+@receiver(post_delete, sender=Task)
+def task_deleted(sender, instance, **kwargs):
+    if is_archiving():
+        # The task moved to the archive; totals and events are unchanged
+        invalidate_task(instance.pk, counts=False)
+        return
+    # Runs in the deleting transaction, for cascades and admin deletes as well
+    TaskTombstone.objects.create(task_id=instance.pk)
+    stats = {"total_tasks": -1, "completed_tasks": -int(instance.completed)}
+    invalidate_task(instance.pk, counts=True)
+    events.publish("task.deleted", {"id": instance.pk}, stats)
+
+
+@receiver(post_save, sender=User)
+def user_saved(sender, instance, created, raw=False, **kwargs):
+    # Task details are keyed by their author's version, so this also covers them
+    cache = get_tiered_cache()
+    cache.invalidate(f"user:{instance.pk}")
+    if created:
+        cache.invalidate("counts")
+
+
+@receiver(post_delete, sender=User)
+def user_deleted(sender, instance, **kwargs):
+    cache = get_tiered_cache()
+    cache.invalidate(f"user:{instance.pk}")
+    cache.invalidate("counts")
@@ -0,0 +1,46 @@
+import msgpack
+import orjson
+from rest_framework import renderers
+from rest_framework.utils import encoders
+
+# Shared fallback for types neither orjson nor msgpack know about
+# (Decimal, lazy translation strings, querysets, ...).
+_fallback_encoder = encoders.JSONEncoder()
+
+
+class ORJSONRenderer(renderers.JSONRenderer):
+    """
+    Renderer which serializes to JSON using orjson.
+
+    orjson encodes datetimes, UUIDs and dataclasses natively and is several
+    times faster than the stdlib encoder on large list responses.
+    """
+
+    options = orjson.OPT_NON_STR_KEYS
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+
+        renderer_context = renderer_context or {}
+        options = self.options
+        if self.get_indent(accepted_media_type, renderer_context):
+            options |= orjson.OPT_INDENT_2
+
+        return orjson.dumps(data, default=_fallback_encoder.default, option=options)
+
+
+class MessagePackRenderer(renderers.BaseRenderer):
+    """
+    Renderer which serializes to MessagePack.
+    """
+
+    media_type = "application/msgpack"
+    format = "msgpack"
+    charset = None
+    render_style = "binary"
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+        return msgpack.packb(data, default=_fallback_encoder.default, use_bin_type=True)
@@ -1,5 +1,6 @@
 from rest_framework import serializers
 
+from .exceptions import PreconditionFailed
 from .models import Task, User
 
 
@@ -22,6 +23,41 @@ class UserSerializer(serializers.ModelSerializer):
         read_only_fields = ["id", "created_at"]
 
 
+class TaskSummarySerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Task
+        fields = ["id", "title", "completed", "created_at"]
+
+
+class UserWithTaskStatsSerializer(UserSerializer):
+    """User with task counts annotated by UserListCreateAPIView"""
+
+    task_stats = serializers.SerializerMethodField()
+    recent_tasks = TaskSummarySerializer(many=True, read_only=True)
+
+    class Meta(UserSerializer.Meta):
+        fields = UserSerializer.Meta.fields + ["task_stats", "recent_tasks"]
+
+    def get_task_stats(self, user):
+        return {
+            "total": user.total_tasks,
+            "completed": user.completed_tasks,
+            "open": user.total_tasks - user.completed_tasks,
+            "latest_task_at": serializers.DateTimeField().to_representation(
+                user.latest_task_at
+            ),
+        }
+
+    def get_fields(self):
+        fields = super().get_fields()
+        include = self.context.get("include", set())
+        if "task_stats" not in include:
+            fields.pop("task_stats")
+        if "recent_tasks" not in include:
+            fields.pop("recent_tasks")
+        return fields
+
+
 class UserCreateSerializer(serializers.ModelSerializer):
     password = serializers.CharField(write_only=True, min_length=8)
 
@@ -58,11 +94,32 @@ class TaskSerializer(serializers.ModelSerializer):
             "created_by",
             "created_at",
             "updated_at",
+            "version",
         ]
-        read_only_fields = ["id", "created_by", "created_at", "updated_at"]
+        read_only_fields = ["id", "created_by", "created_at", "updated_at", "version"]
+
+
+class TaskWithArchivedSerializer(TaskSerializer):
+    archived = serializers.BooleanField(read_only=True)
+
+    class Meta(TaskSerializer.Meta):
+        fields = TaskSerializer.Meta.fields + ["archived"]
+        read_only_fields = TaskSerializer.Meta.read_only_fields + ["archived"]
 
 
 class TaskCreateUpdateSerializer(serializers.ModelSerializer):
     class Meta:
         model = Task
         fields = ["title", "description", "completed"]
+
+    def update(self, instance, validated_data):
+        changed = [
+            field
+            for field, value in validated_data.items()
+            if getattr(instance, field) != value
+        ]
+        for field in changed:
+            setattr(instance, field, validated_data[field])
+        if changed and not instance.save_changed(changed):
+            raise PreconditionFailed()
+        return instance
@@ -0,0 +1,6 @@
+from django.dispatch import Signal
+
+# Sent by TaskQuerySet.update_versioned, which bypasses Model.save() and so
+# post_save. Arguments: ``pk`` and ``values``, the columns written (all of
+# which changed) including the new ``version``.
+task_updated = Signal()
@@ -0,0 +1,105 @@
+import base64
+import json
+from datetime import timedelta
+
+from django.conf import settings
+from django.db.models import Q
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from rest_framework.exceptions import ValidationError
+
+from .models import Task, TaskTombstone
+
+
+def encode_token(task_cursor, tombstone_cursor):
+    """Encode the (timestamp, id) high-water marks into an opaque token"""
+    payload = {
+        "t": _dump_cursor(task_cursor),
+        "d": _dump_cursor(tombstone_cursor),
+    }
+    return base64.urlsafe_b64encode(json.dumps(payload).encode()).decode()
+
+
+def decode_token(token):
+    """Return the (task_cursor, tombstone_cursor) pair stored in a token"""
+    if not token:
+        return None, None
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(token.encode()))
+        return _load_cursor(payload["t"]), _load_cursor(payload["d"])
+    except (ValueError, TypeError, KeyError):
+        raise ValidationError({"since": "Invalid sync token."})
+
+
+def _dump_cursor(cursor):
+    if cursor is None:
+        return None
+    timestamp, pk = cursor
+    return [timestamp.isoformat(), pk]
+
+
+def _load_cursor(value):
+    if value is None:
+        return None
+    timestamp, pk = value
+    timestamp = parse_datetime(timestamp)
+    if timestamp is None:
+        raise ValueError("invalid timestamp")
+    return timestamp, int(pk)
+
+
+def _after(queryset, field, cursor):
+    """Rows strictly after ``cursor`` in (field, id) order"""
+    queryset = queryset.order_by(field, "id")
+    if cursor is None:
+        return queryset
+    timestamp, pk = cursor
+    return queryset.filter(
+        Q(**{f"{field}__gt": timestamp}) | Q(**{field: timestamp, "id__gt": pk})
+    )
+
+
+def get_changes(token, limit):
+    """
+    Return tasks changed and tasks deleted since ``token``.
+
+    Both streams are read in (timestamp, id) order and capped at ``limit`` rows
+    each; ``has_more`` tells the client to call again with the returned token.
+    Changes show up ``TASK_SYNC["SAFETY_LAG"]`` seconds after they are made.
+    """
+    task_cursor, tombstone_cursor = decode_token(token)
+    # Timestamps are taken when a write is made, not when it commits, so a
+    # row can commit with a timestamp below one already returned. Rows newer
+    # than the horizon are held back until any such writes have committed.
+    lag = getattr(settings, "TASK_SYNC", {}).get("SAFETY_LAG", 5)
+    horizon = timezone.now() - timedelta(seconds=lag)
+
+    tasks = list(
+        _after(
+            Task.objects.select_related("created_by").filter(updated_at__lt=horizon),
+            "updated_at",
+            task_cursor,
+        )[: limit + 1]
+    )
+    tombstones = list(
+        _after(
+            TaskTombstone.objects.filter(deleted_at__lt=horizon),
+            "deleted_at",
+            tombstone_cursor,
+        )[: limit + 1]
+    )
+    has_more = len(tasks) > limit or len(tombstones) > limit
+    tasks, tombstones = tasks[:limit], tombstones[:limit]
+
+    if tasks:
+        task_cursor = (tasks[-1].updated_at, tasks[-1].pk)
+    if tombstones:
+        tombstone_cursor = (tombstones[-1].deleted_at, tombstones[-1].pk)
+
+    return {
+        "tasks": tasks,
+        "deleted": [tombstone.task_id for tombstone in tombstones],
+        "next": encode_token(task_cursor, tombstone_cursor),
+        "has_more": has_more,
+    }
@@ -0,0 +1,108 @@
+from datetime import timedelta
+from io import StringIO
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
+from django.urls import reverse
+from django.utils import timezone
+
+from rest_framework.test import APITestCase
+
+from ..cache import get_tiered_cache
+from ..events import get_broker
+from ..models import ArchivedTask, Task, TaskTombstone, User
+
+User = get_user_model()
+
+
+class ArchiveTasksTest(APITestCase):
+    """Test cases for archiving completed tasks"""
+
+    def setUp(self):
+        cache.clear()
+        get_tiered_cache().clear()
+        self.user = User.objects.create_user(
+            username="testuser", email="test@example.com", password="testpass123"
+        )
+        self.old_done = [
+            Task.objects.create(title=f"Old done {i}", created_by=self.user)
+            for i in range(3)
+        ]
+        self.old_open = Task.objects.create(title="Old open", created_by=self.user)
+        self.new_done = Task.objects.create(
+            title="New done", completed=True, created_by=self.user
+        )
+        long_ago = timezone.now() - timedelta(days=365)
+        Task.objects.filter(pk__in=[t.pk for t in self.old_done]).update(
+            completed=True, updated_at=long_ago
+        )
+        Task.objects.filter(pk=self.old_open.pk).update(updated_at=long_ago)
+        self.client.force_authenticate(user=self.user)
+
+    def archive(self, **options):
+        out = StringIO()
+        call_command("archive_tasks", days=30, stdout=out, **options)
+        return out.getvalue()
+
+    def test_moves_only_old_completed_tasks(self):
+        """Test old completed tasks are moved in batches with their ids"""
+        with mock.patch.object(get_broker(), "publish") as publish:
+            with self.captureOnCommitCallbacks(execute=True):
+                output = self.archive(batch_size=2)
+
+        self.assertIn("Archived 3 tasks", output)
+        self.assertEqual(
+            set(ArchivedTask.objects.values_list("pk", flat=True)),
+            {task.pk for task in self.old_done},
+        )
+        self.assertEqual(
+            set(Task.objects.values_list("pk", flat=True)),
+            {self.old_open.pk, self.new_done.pk},
+        )
+        # Archiving is not a deletion
+        self.assertFalse(TaskTombstone.objects.exists())
+        publish.assert_not_called()
+
+        # Deletions after the archive run are real deletions again
+        with mock.patch.object(get_broker(), "publish") as publish:
+            with self.captureOnCommitCallbacks(execute=True):
+                self.new_done.delete()
+        self.assertEqual(publish.call_args.args[0]["type"], "task.deleted")
+
+    def test_stats_include_archived(self):
+        """Test stats count archived tasks"""
+        before = self.client.get(reverse("core:api_stats")).data
+        self.archive()
+        after = self.client.get(reverse("core:api_stats")).data
+        self.assertEqual(after["total_tasks"], before["total_tasks"])
+        self.assertEqual(after["completed_tasks"], before["completed_tasks"])
+
+    def test_list_include_archived(self):
+        """Test include_archived unions the hot and archive tables"""
+        self.archive()
+        url = reverse("core:api_tasks")
+
+        response = self.client.get(url)
+        self.assertEqual(response.data["count"], 2)
+
+        with self.assertNumQueries(3):  # count, page, authors
+            response = self.client.get(url, {"include_archived": "true"})
+        self.assertEqual(response.data["count"], 5)
+        results = response.data["results"]
+        self.assertEqual(
+            [task["id"] for task in results],
+            sorted((task["id"] for task in results), reverse=True),
+        )
+        archived = {task["id"] for task in results if task["archived"]}
+        self.assertEqual(archived, {task.pk for task in self.old_done})
+        self.assertEqual(results[0]["created_by"]["username"], "testuser")
+
+    def test_archived_task_detail_gone(self):
+        """Test archived tasks no longer resolve on the detail endpoint"""
+        url = reverse("core:api_task_detail", kwargs={"pk": self.old_done[0].pk})
+        self.client.get(url)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.archive()
+        self.assertEqual(self.client.get(url).status_code, 404)
@@ -0,0 +1,151 @@
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from ..cache import TieredCache, get_tiered_cache
+from ..models import Task, User
+
+User = get_user_model()
+
+
+class TieredCacheTest(TestCase):
+    """Test cases for the two-tier cache"""
+
+    def setUp(self):
+        cache.clear()
+        self.cache = TieredCache(max_entries=10)
+        self.calls = 0
+
+    def compute(self):
+        self.calls += 1
+        return {"value": self.calls}
+
+    def test_local_tier_serves_repeat_reads(self):
+        """Test repeat reads are served by the local tier"""
+        self.assertEqual(self.cache.get_or_set("ns", "key", self.compute)["value"], 1)
+        self.assertEqual(self.cache.get_or_set("ns", "key", self.compute)["value"], 1)
+        self.assertEqual(self.calls, 1)
+        self.assertEqual(self.cache.stats["local"], {"hits": 1, "misses": 1})
+        self.assertEqual(self.cache.stats["shared"], {"hits": 0, "misses": 1})
+
+    def test_shared_tier_across_processes(self):
+        """Test a second process finds the value in the shared tier"""
+        self.cache.get_or_set("ns", "key", self.compute)
+        other = TieredCache()
+        self.assertEqual(other.get_or_set("ns", "key", self.compute)["value"], 1)
+        self.assertEqual(other.stats["shared"], {"hits": 1, "misses": 0})
+
+    def test_invalidate_bumps_version(self):
+        """Test invalidating a namespace recomputes its keys"""
+        self.cache.get_or_set("ns", "key", self.compute)
+        self.cache.get_or_set("other", "key", self.compute)
+        self.cache.invalidate("ns")
+        self.assertEqual(self.cache.get_or_set("ns", "key", self.compute)["value"], 3)
+        self.assertEqual(
+            self.cache.get_or_set("other", "key", self.compute)["value"], 2
+        )
+
+    def test_invalidation_reaches_other_processes(self):
+        """Test other processes see the new version once their copy expires"""
+        other = TieredCache(local_ttl=0)
+        other.get_or_set("ns", "key", self.compute)
+        self.cache.invalidate("ns")
+        self.assertEqual(other.get_or_set("ns", "key", self.compute)["value"], 2)
+
+    def test_local_tier_is_bounded(self):
+        """Test the local tier evicts the least recently used entries"""
+        for i in range(20):
+            self.cache.get_or_set("ns", i, self.compute)
+        self.assertEqual(len(self.cache._local), 10)
+
+
+class CachedViewsTest(APITestCase):
+    """Test cases for views served from the tiered cache"""
+
+    def setUp(self):
+        cache.clear()
+        get_tiered_cache().clear()
+        self.user = User.objects.create_user(
+            username="testuser", email="test@example.com", password="testpass123"
+        )
+        self.admin_user = User.objects.create_superuser(
+            username="admin", email="admin@example.com", password="adminpass123"
+        )
+        self.task = Task.objects.create(title="Test Task", created_by=self.user)
+        self.client.force_authenticate(user=self.user)
+
+    def test_stats_cached_until_tasks_change(self):
+        """Test stats come from cache and are invalidated by task writes"""
+        url = reverse("core:api_stats")
+        self.client.get(url)
+        with self.assertNumQueries(0):
+            response = self.client.get(url)
+        self.assertEqual(response.data["total_tasks"], 1)
+
+        self.client.patch(
+            reverse("core:api_task_detail", kwargs={"pk": self.task.pk}),
+            {"completed": True},
+            format="json",
+            HTTP_IF_MATCH='"1"',
+        )
+        self.client.post(reverse("core:api_tasks"), {"title": "New"}, format="json")
+        response = self.client.get(url)
+        self.assertEqual(response.data["total_tasks"], 2)
+        self.assertEqual(response.data["completed_tasks"], 1)
+
+    def test_task_detail_cached_until_updated(self):
+        """Test task detail is cached and invalidated by updates"""
+        url = reverse("core:api_task_detail", kwargs={"pk": self.task.pk})
+        self.client.get(url)
+        with self.assertNumQueries(0):
+            response = self.client.get(url)
+        self.assertEqual(response["ETag"], '"1"')
+
+        self.client.patch(url, {"title": "Renamed"}, format="json")
+        response = self.client.get(url)
+        self.assertEqual(response.data["title"], "Renamed")
+        self.assertEqual(response["ETag"], '"2"')
+
+    def test_task_detail_invalidated_by_author_change(self):
+        """Test task detail picks up changes to its embedded author"""
+        url = reverse("core:api_task_detail", kwargs={"pk": self.task.pk})
+        self.client.get(url)
+        self.user.first_name = "Renamed"
+        self.user.save()
+        response = self.client.get(url)
+        self.assertEqual(response.data["created_by"]["first_name"], "Renamed")
+
+    def test_author_change_is_one_invalidation(self):
+        """Test saving a user bumps one namespace however many tasks they own"""
+        Task.objects.bulk_create(
+            Task(title=f"Task {i}", created_by=self.user) for i in range(50)
+        )
+        with mock.patch.object(get_tiered_cache(), "_bump") as bump:
+            with self.assertNumQueries(1):  # the UPDATE itself
+                self.user.first_name = "Renamed"
+                self.user.save()
+        bump.assert_called_once_with(f"user:{self.user.pk}")
+
+    def test_missing_task_not_cached(self):
+        """Test 404s are not cached"""
+        url = reverse("core:api_task_detail", kwargs={"pk": self.task.pk + 100})
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_cache_stats_admin_only(self):
+        """Test cache metrics are exposed to admins"""
+        url = reverse("core:api_cache_stats")
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+        self.client.get(reverse("core:api_stats"))
+        self.client.force_authenticate(user=self.admin_user)
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["shared"]["misses"], 1)
@@ -0,0 +1,209 @@
+import threading
+import time
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from rest_framework import status
+from rest_framework.test import APITransactionTestCase
+
+from ..coalescing import (
+    CONFLICT,
+    DROPPED,
+    MISSING,
+    PENDING,
+    UNCHANGED,
+    UPDATED,
+    PendingToggle,
+    ToggleCoalescer,
+)
+from ..models import Task, User
+
+User = get_user_model()
+
+
+class ToggleCoalescerTest(TransactionTestCase):
+    """Test cases for write-behind toggle batching"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username="testuser", email="test@example.com", password="testpass123"
+        )
+        self.tasks = [
+            Task.objects.create(title=f"Task {i}", created_by=self.user)
+            for i in range(3)
+        ]
+        self.coalescer = ToggleCoalescer(window=0)
+
+    def test_outcomes(self):
+        """Test updated, unchanged, conflicting and missing toggles"""
+        pk = self.tasks[0].pk
+        self.assertEqual(self.coalescer.submit(pk, 1, True), (UPDATED, 2))
+        self.assertEqual(self.coalescer.submit(pk, 2, True), (UNCHANGED, 2))
+        self.assertEqual(self.coalescer.submit(pk, 1, False), (CONFLICT, None))
+        self.assertEqual(self.coalescer.submit(pk + 100, 1, True), (MISSING, None))
+
+        task = Task.objects.get(pk=pk)
+        self.assertTrue(task.completed)
+        self.assertEqual(task.version, 2)
+
+    def test_batch_is_one_update(self):
+        """Test a batch of toggles is written with a single UPDATE"""
+        batch = [PendingToggle(task.pk, 1, True) for task in self.tasks]
+        with CaptureQueriesContext(connection) as queries:
+            self.coalescer._flush(batch)
+
+        updates = [q["sql"] for q in queries if q["sql"].startswith("UPDATE")]
+        self.assertEqual(len(updates), 1)
+        self.assertIn("CASE", updates[0])
+        self.assertEqual([toggle.outcome for toggle in batch], [UPDATED] * 3)
+        self.assertEqual(Task.objects.filter(completed=True, version=2).count(), 3)
+        self.assertEqual(self.coalescer.stats["last_flush_size"], 3)
+
+    def test_repeated_task_in_batch(self):
+        """Test toggles of the same task in one batch apply in order"""
+        pk = self.tasks[0].pk
+        batch = [PendingToggle(pk, 1, True), PendingToggle(pk, 2, False)]
+        self.coalescer._flush(batch)
+        self.assertEqual([toggle.new_version for toggle in batch], [2, 3])
+        self.assertFalse(Task.objects.get(pk=pk).completed)
+
+    def test_concurrent_toggles_share_a_flush(self):
+        """Test toggles arriving within the window are flushed together"""
+        coalescer = ToggleCoalescer(window=1, max_batch=3)
+        flushed = []
+
+        def write(toggles):
+            flushed.append(len(toggles))
+            for toggle in toggles:
+                toggle.outcome = UPDATED
+
+        with mock.patch.object(coalescer, "_write", side_effect=write):
+            threads = [
+                threading.Thread(target=coalescer.submit, args=(pk, 1, True))
+                for pk in range(3)
+            ]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+        self.assertEqual(flushed, [3])
+        self.assertEqual(coalescer.stats["flushes"], 1)
+
+    def test_queued_toggle_times_out_unwritten(self):
+        """Test a toggle still queued at the timeout is withdrawn, not written"""
+        coalescer = ToggleCoalescer(window=0.3, timeout=0.05)
+        pk = self.tasks[0].pk
+        self.assertEqual(coalescer.submit(pk, 1, True), (DROPPED, None))
+        time.sleep(0.4)
+
+        self.assertEqual(coalescer.stats["flushes"], 0)
+        self.assertEqual(coalescer.stats["dropped"], 1)
+        self.assertFalse(Task.objects.get(pk=pk).completed)
+
+    def test_flushing_toggle_outlives_timeout(self):
+        """Test a toggle caught in a slow flush reports that flush's result"""
+        coalescer = ToggleCoalescer(window=0, timeout=0.15)
+
+        def write(toggles):
+            time.sleep(0.2)
+            for toggle in toggles:
+                toggle.outcome, toggle.new_version = UPDATED, 2
+
+        with mock.patch.object(coalescer, "_write", side_effect=write):
+            self.assertEqual(coalescer.submit(self.tasks[0].pk, 1, True), (UPDATED, 2))
+
+    def test_connection_error_releases_callers(self):
+        """Test a failing connection check still answers every caller"""
+        coalescer = ToggleCoalescer(window=0, timeout=1)
+        with mock.patch(
+            "core.coalescing.close_old_connections",
+            side_effect=RuntimeError("db gone"),
+        ):
+            with self.assertRaisesMessage(RuntimeError, "db gone"):
+                coalescer.submit(self.tasks[0].pk, 1, True)
+        self.assertTrue(coalescer._thread.is_alive())
+
+    def test_stuck_flush_is_pending(self):
+        """Test a flush outlasting a second timeout reports PENDING"""
+        coalescer = ToggleCoalescer(window=0, timeout=0.05)
+        release = threading.Event()
+        self.addCleanup(release.set)
+
+        with mock.patch.object(
+            coalescer, "_write", side_effect=lambda toggles: release.wait(5)
+        ):
+            self.assertEqual(
+                coalescer.submit(self.tasks[0].pk, 1, True), (PENDING, None)
+            )
+
+
+@override_settings(WRITE_COALESCING={"ENABLED": True, "WINDOW_MS": 0})
+class WriteBehindAPITest(APITransactionTestCase):
+    """Test cases for write-behind toggles through the API"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username="testuser", email="test@example.com", password="testpass123"
+        )
+        self.admin_user = User.objects.create_superuser(
+            username="admin", email="admin@example.com", password="adminpass123"
+        )
+        self.task = Task.objects.create(title="Test Task", created_by=self.user)
+        self.url = reverse("core:api_task_detail", kwargs={"pk": self.task.pk})
+
+    def test_toggle_is_acknowledged_after_flush(self):
+        """Test a coalesced toggle is written before the response"""
+        self.client.force_authenticate(user=self.user)
+        response = self.client.patch(
+            self.url, {"completed": True}, format="json", HTTP_IF_MATCH='"1"'
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response["ETag"], '"2"')
+        self.assertTrue(Task.objects.get(pk=self.task.pk).completed)
+
+        response = self.client.patch(
+            self.url, {"completed": False}, format="json", HTTP_IF_MATCH='"1"'
+        )
+        self.assertEqual(response.status_code, status.HTTP_412_PRECONDITION_FAILED)
+
+    def test_dropped_toggle_is_unavailable(self):
+        """Test a toggle discarded at the timeout is answered with 503"""
+        self.client.force_authenticate(user=self.user)
+        with mock.patch(
+            "core.coalescing.ToggleCoalescer.submit", return_value=(DROPPED, None)
+        ):
+            response = self.client.patch(
+                self.url, {"completed": True}, format="json", HTTP_IF_MATCH='"1"'
+            )
+        self.assertEqual(response.status_code, status.HTTP_503_SERVICE_UNAVAILABLE)
+
+    async def test_asgi_requests_bypass_coalescer(self):
+        """Test toggles served over ASGI are written directly"""
+        await self.async_client.aforce_login(self.user)
+        with mock.patch("core.coalescing.ToggleCoalescer.submit") as submit:
+            response = await self.async_client.patch(
+                self.url,
+                {"completed": True},
+                content_type="application/json",
+                headers={"if-match": '"1"'},
+            )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response["ETag"], '"2"')
+        submit.assert_not_called()
+
+    def test_write_stats(self):
+        """Test flush metrics are exposed to admins"""
+        self.client.force_authenticate(user=self.admin_user)
+        self.client.patch(
+            self.url, {"completed": True}, format="json", HTTP_IF_MATCH='"1"'
+        )
+        response = self.client.get(reverse("core:api_write_stats"))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertGreaterEqual(response.data["flushes"], 1)
+        self.assertIn("avg_flush_ms", response.data)
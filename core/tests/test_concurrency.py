@@ -0,0 +1,119 @@
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from ..models import Task, User
+
+User = get_user_model()
+
+
+class OptimisticLockingTest(APITestCase):
+    """Test cases for versioned, conditional task writes"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username="testuser", email="test@example.com", password="testpass123"
+        )
+        self.task = Task.objects.create(
+            title="Test Task", description="Test description", created_by=self.user
+        )
+        self.client.force_authenticate(user=self.user)
+        self.url = reverse("core:api_task_detail", kwargs={"pk": self.task.pk})
+
+    def test_retrieve_sets_etag(self):
+        """Test task detail exposes the version as ETag"""
+        response = self.client.get(self.url)
+        self.assertEqual(response["ETag"], '"1"')
+        self.assertEqual(response.data["version"], 1)
+
+    def test_update_with_matching_if_match(self):
+        """Test a write with the current version succeeds and bumps it"""
+        response = self.client.patch(
+            self.url, {"title": "Updated"}, format="json", HTTP_IF_MATCH='"1"'
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response["ETag"], '"2"')
+        self.task.refresh_from_db()
+        self.assertEqual(self.task.title, "Updated")
+        self.assertEqual(self.task.version, 2)
+
+    def test_update_with_stale_if_match(self):
+        """Test a write with an old version returns 412 and changes nothing"""
+        Task.objects.filter(pk=self.task.pk).update(version=2)
+        response = self.client.patch(
+            self.url, {"title": "Updated"}, format="json", HTTP_IF_MATCH='"1"'
+        )
+        self.assertEqual(response.status_code, status.HTTP_412_PRECONDITION_FAILED)
+        self.task.refresh_from_db()
+        self.assertEqual(self.task.title, "Test Task")
+
+    def test_update_writes_only_changed_columns(self):
+        """Test unchanged fields are left out of the UPDATE"""
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.patch(
+                self.url, {"title": "Test Task", "completed": True}, format="json"
+            )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        updates = [q["sql"] for q in queries if q["sql"].startswith("UPDATE")]
+        self.assertEqual(len(updates), 1)
+        self.assertIn('"completed"', updates[0])
+        self.assertNotIn('"title"', updates[0])
+        self.assertNotIn('"description"', updates[0])
+
+    def test_toggle_is_single_conditional_update(self):
+        """Test a toggle with If-Match runs one UPDATE and no SELECT"""
+        with self.assertNumQueries(1):
+            response = self.client.patch(
+                self.url, {"completed": True}, format="json", HTTP_IF_MATCH='"1"'
+            )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data, {"completed": True})
+        self.assertEqual(response["ETag"], '"2"')
+        self.task.refresh_from_db()
+        self.assertTrue(self.task.completed)
+        self.assertEqual(self.task.version, 2)
+
+    def test_toggle_with_stale_if_match(self):
+        """Test a toggle against an old version returns 412"""
+        response = self.client.patch(
+            self.url, {"completed": True}, format="json", HTTP_IF_MATCH='W/"5"'
+        )
+        self.assertEqual(response.status_code, status.HTTP_412_PRECONDITION_FAILED)
+        self.task.refresh_from_db()
+        self.assertFalse(self.task.completed)
+
+    def test_toggle_missing_task(self):
+        """Test a toggle on a missing task returns 404"""
+        url = reverse("core:api_task_detail", kwargs={"pk": self.task.pk + 1})
+        response = self.client.patch(
+            url, {"completed": True}, format="json", HTTP_IF_MATCH='"1"'
+        )
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_save_changed_detects_concurrent_write(self):
+        """Test save_changed refuses to overwrite a newer row"""
+        stale = Task.objects.get(pk=self.task.pk)
+        self.task.title = "First writer"
+        self.task.save()
+
+        stale.title = "Second writer"
+        self.assertFalse(stale.save_changed(["title"]))
+        self.task.refresh_from_db()
+        self.assertEqual(self.task.title, "First writer")
+
+    def test_stale_saves_get_distinct_versions(self):
+        """Test two saves from the same stale read never share a version"""
+        first = Task.objects.get(pk=self.task.pk)
+        second = Task.objects.get(pk=self.task.pk)
+        first.title = "First"
+        first.save()
+        second.title = "Second"
+        second.save()
+
+        self.assertEqual((first.version, second.version), (2, 3))
+        self.task.refresh_from_db()
+        self.assertEqual((self.task.title, self.task.version), ("Second", 3))
@@ -0,0 +1,190 @@
+import asyncio
+import base64
+import threading
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from ..events import LocalBroker, get_broker
+from ..models import Task, User
+
+User = get_user_model()
+
+
+class LocalBrokerTest(TestCase):
+    """Test cases for the in-process event broker"""
+
+    async def test_publish_from_another_thread(self):
+        """Test events published from a worker thread reach subscribers"""
+        broker = LocalBroker()
+        with broker.subscribe() as subscription:
+            thread = threading.Thread(target=broker.publish, args=({"n": 1},))
+            thread.start()
+            thread.join()
+            self.assertEqual(await subscription.get(timeout=1), {"n": 1})
+            self.assertIsNone(await subscription.get(timeout=0.01))
+
+    async def test_full_queue_drops_events(self):
+        """Test a slow subscriber loses events instead of blocking publishers"""
+        broker = LocalBroker(max_queue_size=1)
+        with broker.subscribe() as subscription:
+            broker.publish({"n": 1})
+            broker.publish({"n": 2})
+            await asyncio.sleep(0)
+            self.assertEqual(await subscription.get(timeout=1), {"n": 1})
+            self.assertIsNone(await subscription.get(timeout=0.01))
+
+    async def test_unsubscribe(self):
+        """Test closed subscriptions stop receiving events"""
+        broker = LocalBroker()
+        with broker.subscribe() as subscription:
+            pass
+        broker.publish({"n": 1})
+        self.assertIsNone(await subscription.get(timeout=0.01))
+
+
+class TaskEventsTest(APITestCase):
+    """Test cases for task change events"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username="testuser", email="test@example.com", password="testpass123"
+        )
+        self.task = Task.objects.create(title="Test Task", created_by=self.user)
+        self.client.force_authenticate(user=self.user)
+        self.url = reverse("core:api_task_detail", kwargs={"pk": self.task.pk})
+
+    def capture_events(self, action):
+        with mock.patch.object(get_broker(), "publish") as publish:
+            with self.captureOnCommitCallbacks(execute=True):
+                action()
+        return [call.args[0] for call in publish.call_args_list]
+
+    def test_create_event(self):
+        """Test creating a task publishes task.created and a stats delta"""
+        (event,) = self.capture_events(
+            lambda: self.client.post(
+                reverse("core:api_tasks"), {"title": "New Task"}, format="json"
+            )
+        )
+        self.assertEqual(event["type"], "task.created")
+        self.assertEqual(event["task"]["title"], "New Task")
+        self.assertEqual(event["stats"], {"total_tasks": 1, "completed_tasks": 0})
+
+    def test_update_event(self):
+        """Test updating a task reports the completed delta"""
+        (event,) = self.capture_events(
+            lambda: self.client.patch(self.url, {"completed": True}, format="json")
+        )
+        self.assertEqual(event["type"], "task.updated")
+        self.assertEqual(event["task"]["id"], self.task.pk)
+        self.assertTrue(event["task"]["completed"])
+        self.assertEqual(event["stats"], {"completed_tasks": 1})
+
+    def test_toggle_event(self):
+        """Test conditional toggles publish events, no-op toggles do not"""
+        (event,) = self.capture_events(
+            lambda: self.client.patch(
+                self.url, {"completed": True}, format="json", HTTP_IF_MATCH='"1"'
+            )
+        )
+        self.assertEqual(event["task"]["version"], 2)
+        self.assertEqual(event["stats"], {"completed_tasks": 1})
+
+        responses = []
+        events = self.capture_events(
+            lambda: responses.append(
+                self.client.patch(
+                    self.url, {"completed": True}, format="json", HTTP_IF_MATCH='"2"'
+                )
+            )
+        )
+        self.assertEqual(events, [])
+        self.assertEqual(responses[0].status_code, status.HTTP_200_OK)
+        self.assertEqual(responses[0]["ETag"], '"2"')
+
+    def test_broker_failure_does_not_fail_request(self):
+        """Test a broker outage after commit still answers the write"""
+        with mock.patch.object(
+            get_broker(), "publish", side_effect=ConnectionError("down")
+        ):
+            with self.captureOnCommitCallbacks(execute=True):
+                response = self.client.patch(
+                    self.url, {"completed": True}, format="json"
+                )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.task.refresh_from_db()
+        self.assertTrue(self.task.completed)
+
+    def test_delete_event(self):
+        """Test deleting a task publishes task.deleted"""
+        (event,) = self.capture_events(lambda: self.client.delete(self.url))
+        self.assertEqual(event["type"], "task.deleted")
+        self.assertEqual(event["task"], {"id": self.task.pk})
+        self.assertEqual(event["stats"], {"total_tasks": -1, "completed_tasks": 0})
+
+
+class EventStreamTest(TestCase):
+    """Test cases for the Server-Sent Events endpoint"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username="testuser", email="test@example.com", password="testpass123"
+        )
+
+    async def test_requires_authentication(self):
+        """Test anonymous clients are rejected"""
+        response = await self.async_client.get(reverse("core:api_events"))
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_requires_asgi(self):
+        """Test the stream is refused when served over WSGI"""
+        self.client.force_login(self.user)
+        response = self.client.get(reverse("core:api_events"))
+        self.assertEqual(response.status_code, status.HTTP_501_NOT_IMPLEMENTED)
+
+    async def test_basic_authentication(self):
+        """Test clients using the API's Basic auth can subscribe"""
+        credentials = base64.b64encode(b"testuser:testpass123").decode()
+        response = await self.async_client.get(
+            reverse("core:api_events"),
+            headers={"authorization": f"Basic {credentials}"},
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        stream = response.streaming_content
+        self.assertEqual(await anext(stream), b": connected\n\n")
+        await stream.aclose()
+
+        response = await self.async_client.get(
+            reverse("core:api_events"), headers={"authorization": "Basic bad"}
+        )
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    async def test_streams_events(self):
+        """Test published events are streamed as SSE frames"""
+        await self.async_client.aforce_login(self.user)
+        response = await self.async_client.get(reverse("core:api_events"))
+        self.assertEqual(response["Content-Type"], "text/event-stream")
+
+        stream = response.streaming_content
+        self.assertEqual(await anext(stream), b": connected\n\n")
+        get_broker().publish(
+            {
+                "type": "task.deleted",
+                "task": {"id": 7},
+                "stats": {"total_tasks": -1, "completed_tasks": 0},
+            }
+        )
+        self.assertEqual(
+            await anext(stream), b'event: task.deleted\ndata: {"id": 7}\n\n'
+        )
+        self.assertEqual(
+            await anext(stream),
+            b'event: stats\ndata: {"total_tasks": -1, "completed_tasks": 0}\n\n',
+        )
+        await stream.aclose()
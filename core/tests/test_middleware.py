@@ -0,0 +1,84 @@
+import gzip
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+import brotli
+from rest_framework.test import APITestCase
+
+from ..models import Task, User
+
+User = get_user_model()
+
+
+class CompressionMiddlewareTest(APITestCase):
+    """Test cases for response compression"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username="testuser", email="test@example.com", password="testpass123"
+        )
+        Task.objects.bulk_create(
+            Task(title=f"Task {i}", description="x" * 100, created_by=self.user)
+            for i in range(20)
+        )
+        self.client.force_authenticate(user=self.user)
+        self.url = reverse("core:api_tasks")
+
+    def test_gzip_large_response(self):
+        """Test large responses are gzipped"""
+        response = self.client.get(self.url, HTTP_ACCEPT_ENCODING="gzip")
+        self.assertEqual(response["Content-Encoding"], "gzip")
+        self.assertIn(b"Task 0", gzip.decompress(response.content))
+        self.assertIn("Accept-Encoding", response["Vary"])
+
+    def test_brotli_preferred(self):
+        """Test brotli is used when the client accepts it"""
+        response = self.client.get(self.url, HTTP_ACCEPT_ENCODING="gzip, br")
+        self.assertEqual(response["Content-Encoding"], "br")
+        self.assertIn(b"Task 0", brotli.decompress(response.content))
+        self.assertEqual(response["Content-Length"], str(len(response.content)))
+
+    def test_refused_encodings(self):
+        """Test codings with q=0 are never used"""
+        response = self.client.get(self.url, HTTP_ACCEPT_ENCODING="gzip, br;q=0")
+        self.assertEqual(response["Content-Encoding"], "gzip")
+
+        response = self.client.get(
+            self.url, HTTP_ACCEPT_ENCODING="br;q=0, gzip;q=0, identity"
+        )
+        self.assertFalse(response.has_header("Content-Encoding"))
+        self.assertIn("Accept-Encoding", response["Vary"])
+
+        response = self.client.get(self.url, HTTP_ACCEPT_ENCODING="*;q=0.5, gzip;q=0")
+        self.assertEqual(response["Content-Encoding"], "br")
+
+    def test_html_is_not_brotli_compressed(self):
+        """Test HTML pages get gzip and its BREACH padding instead of brotli"""
+        response = self.client.get(
+            reverse("core:tasks_list"), HTTP_ACCEPT_ENCODING="gzip, br"
+        )
+        self.assertEqual(response["Content-Encoding"], "gzip")
+
+    def test_no_accept_encoding(self):
+        """Test responses are left alone without Accept-Encoding"""
+        response = self.client.get(self.url)
+        self.assertFalse(response.has_header("Content-Encoding"))
+
+    @override_settings(COMPRESSION_MIN_SIZE=1024 * 1024)
+    def test_below_threshold(self):
+        """Test responses below COMPRESSION_MIN_SIZE are not compressed"""
+        response = self.client.get(self.url, HTTP_ACCEPT_ENCODING="gzip, br")
+        self.assertFalse(response.has_header("Content-Encoding"))
+
+
+class HealthCheckMiddlewareTest(TestCase):
+    """Test cases for the /healthz endpoint"""
+
+    def test_healthz(self):
+        """Test /healthz answers without queries or host validation"""
+        with self.assertNumQueries(0):
+            response = self.client.get("/healthz", HTTP_HOST="unknown.invalid")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.content, b"ok")
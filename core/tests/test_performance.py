@@ -0,0 +1,187 @@
+"""
+Performance regression gate.
+
+Query counts per request must not grow with the number of rows, and must
+match ``perf_baseline.json``. TaskSerializer time, as a multiple of building
+the same dicts by hand, must stay within ``tolerance`` times the baseline. After an intentional change, refresh
+the baseline with::
+
+    UPDATE_PERF_BASELINE=1 python -m pytest core/tests/test_performance.py
+
+The timing check is marked ``slow``; CI runs it in its own step without
+coverage, whose tracing would skew the ratio.
+"""
+
+import json
+import os
+import time
+from pathlib import Path
+
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+import pytest
+from rest_framework.test import APIClient
+
+from core.benchmarks import build_tasks
+from core.cache import get_tiered_cache
+from core.models import Task, User
+from core.serializers import TaskSerializer
+
+BASELINE_PATH = Path(__file__).with_name("perf_baseline.json")
+UPDATE_BASELINE = os.environ.get("UPDATE_PERF_BASELINE") == "1"
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture(scope="module")
+def baseline():
+    data = json.loads(BASELINE_PATH.read_text()) if BASELINE_PATH.exists() else {}
+    data.setdefault("queries", {})
+    yield data
+    if UPDATE_BASELINE:
+        BASELINE_PATH.write_text(json.dumps(data, indent=2, sort_keys=True) + "\n")
+
+
+@pytest.fixture
+def api_client():
+    user = User.objects.create_user(
+        username="perfuser", email="perf@example.com", password="perfpass123"
+    )
+    client = APIClient()
+    client.force_authenticate(user=user)
+    return client
+
+
+@pytest.fixture
+def count_queries(api_client):
+    """Return a function that GETs a URL and returns the queries it ran"""
+
+    def count(url, **params):
+        cache.clear()
+        get_tiered_cache().clear()
+        with CaptureQueriesContext(connection) as queries:
+            response = api_client.get(url, params)
+        assert response.status_code == 200, response.content
+        return len(queries)
+
+    return count
+
+
+def create_tasks(count):
+    users = [
+        User.objects.get_or_create(
+            username=f"owner{i}", defaults={"email": f"owner{i}@example.com"}
+        )[0]
+        for i in range(min(count, 5))
+    ]
+    return Task.objects.bulk_create(
+        Task(title=f"Task {i}", completed=i % 2 == 0, created_by=users[i % len(users)])
+        for i in range(count)
+    )
+
+
+def check_queries(baseline, name, counts):
+    """Query count must be flat across row counts and match the baseline"""
+    assert len(set(counts)) == 1, f"{name}: query count grows with rows {counts}"
+    if UPDATE_BASELINE:
+        baseline["queries"][name] = counts[0]
+    else:
+        assert (
+            counts[0] == baseline["queries"][name]
+        ), f"{name}: {counts[0]} queries, baseline {baseline['queries'][name]}"
+
+
+@pytest.mark.parametrize(
+    "name, params",
+    [
+        ("task_list", {}),
+        ("task_list_archived", {"include_archived": "true"}),
+        ("task_changes", {}),
+        ("user_list_stats", {"include": "task_stats,recent_tasks"}),
+    ],
+)
+def test_list_queries_constant(baseline, count_queries, settings, name, params):
+    """Test list endpoints run the same number of queries for 1 and 100 rows"""
+    # Let the changes endpoint return the rows just created
+    settings.TASK_SYNC = {"SAFETY_LAG": 0}
+    url = {
+        "task_list": reverse("core:api_tasks"),
+        "task_list_archived": reverse("core:api_tasks"),
+        "task_changes": reverse("core:api_task_changes"),
+        "user_list_stats": reverse("core:api_users"),
+    }[name]
+    counts = []
+    for total in (1, 100):
+        Task.objects.all().delete()
+        create_tasks(total)
+        counts.append(count_queries(url, **params))
+    check_queries(baseline, name, counts)
+
+
+def test_task_detail_queries(baseline, count_queries):
+    """Test task detail loads the task and its author in one query"""
+    tasks = create_tasks(100)
+    counts = [
+        count_queries(reverse("core:api_task_detail", kwargs={"pk": task.pk}))
+        for task in (tasks[0], tasks[-1])
+    ]
+    check_queries(baseline, "task_detail", counts)
+
+
+def plain_task_dicts(tasks):
+    """Hand-written equivalent of TaskSerializer, the reference workload"""
+    return [
+        {
+            "id": task.id,
+            "title": task.title,
+            "description": task.description,
+            "completed": task.completed,
+            "created_by": {
+                "id": task.created_by.id,
+                "username": task.created_by.username,
+                "email": task.created_by.email,
+                "first_name": task.created_by.first_name,
+                "last_name": task.created_by.last_name,
+                "full_name": task.created_by.get_full_display_name(),
+                "age": task.created_by.age,
+                "bio": task.created_by.bio,
+                "created_at": task.created_by.created_at.isoformat(),
+            },
+            "created_at": task.created_at.isoformat(),
+            "updated_at": task.updated_at.isoformat(),
+            "version": task.version,
+        }
+        for task in tasks
+    ]
+
+
+def best_time(func, repeat=20):
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+@pytest.mark.slow
+def test_task_serialization_cost(baseline):
+    """Test TaskSerializer cost relative to plain dicts against the baseline"""
+    tasks = build_tasks(100)
+    # A ratio to a reference timed in the same run cancels out host speed
+    ratio = best_time(lambda: TaskSerializer(tasks, many=True).data) / best_time(
+        lambda: plain_task_dicts(tasks)
+    )
+
+    if UPDATE_BASELINE:
+        baseline["task_serializer_ratio"] = round(ratio, 2)
+        baseline.setdefault("tolerance", 2.0)
+        return
+    limit = baseline["task_serializer_ratio"] * baseline["tolerance"]
+    assert ratio <= limit, (
+        f"TaskSerializer: {ratio:.1f}x plain dicts, "
+        f"baseline {baseline['task_serializer_ratio']}x"
+    )
@@ -0,0 +1,126 @@
+import json
+import shutil
+import sys
+import tempfile
+import time
+from io import StringIO
+from pathlib import Path
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.http import HttpResponse
+from django.test import override_settings
+from django.urls import path, reverse
+
+from rest_framework.test import APITestCase
+
+from ..models import Task, User
+from ..profiling import collapse_stack, sample_stack
+
+User = get_user_model()
+
+
+def slow_view(request):
+    # Long enough for the sampler to catch it several times
+    time.sleep(0.05)
+    return HttpResponse("ok")
+
+
+urlpatterns = [path("slow/", slow_view)]
+
+
+class ProfilingMiddlewareTest(APITestCase):
+    """Test cases for request profiling"""
+
+    def setUp(self):
+        self.directory = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, self.directory)
+        self.user = User.objects.create_user(
+            username="testuser", email="test@example.com", password="testpass123"
+        )
+        Task.objects.create(title="Test Task", created_by=self.user)
+        self.client.force_authenticate(user=self.user)
+
+    def profiling(self, **config):
+        return override_settings(
+            PROFILING={"ENABLED": True, "DIRECTORY": self.directory, **config}
+        )
+
+    def stored_profiles(self):
+        return [json.loads(p.read_text()) for p in self.directory.glob("*.json")]
+
+    def test_sampled_request_is_stored(self):
+        """Test a sampled request stores its URL name and SQL"""
+        with self.profiling(SAMPLE_RATE=1, SLOW_THRESHOLD_MS=10_000):
+            self.client.get(reverse("core:api_tasks"))
+
+        (profile,) = self.stored_profiles()
+        self.assertEqual(profile["url_name"], "core:api_tasks")
+        self.assertEqual(profile["status"], 200)
+        self.assertTrue(
+            any('FROM "core_task"' in query["sql"] for query in profile["queries"])
+        )
+
+    def test_slow_request_is_stored(self):
+        """Test requests above the latency threshold are always stored"""
+        with self.profiling(SAMPLE_RATE=0, SLOW_THRESHOLD_MS=0):
+            self.client.get(reverse("core:api_stats"))
+        self.assertEqual(len(self.stored_profiles()), 1)
+
+    def test_fast_unsampled_request_is_skipped(self):
+        """Test fast requests outside the sample are not stored"""
+        with self.profiling(SAMPLE_RATE=0, SLOW_THRESHOLD_MS=10_000):
+            self.client.get(reverse("core:api_stats"))
+        self.assertEqual(self.stored_profiles(), [])
+
+    def test_disabled_by_default(self):
+        """Test nothing is stored unless profiling is enabled"""
+        with override_settings(PROFILING={"DIRECTORY": self.directory}):
+            self.client.get(reverse("core:api_stats"))
+        self.assertFalse(any(self.directory.iterdir()))
+
+    def test_collapse_stack(self):
+        """Test stacks are collapsed root first, leaf last"""
+        stack = collapse_stack(sample_stack(sys._getframe()))
+        self.assertTrue(stack.split(";")[-1].startswith("test_collapse_stack ("))
+
+    @override_settings(ROOT_URLCONF=__name__)
+    def test_sampler_captures_view_stack(self):
+        """Test a slow request's stored stacks include the running view"""
+        with self.profiling(SAMPLE_RATE=1, INTERVAL=0.005):
+            self.client.get("/slow/")
+
+        (profile,) = self.stored_profiles()
+        self.assertTrue(profile["stacks"])
+        self.assertTrue(
+            any(
+                stack.split(";")[-1].startswith("slow_view (")
+                for stack in profile["stacks"]
+            ),
+            list(profile["stacks"]),
+        )
+
+    def test_aggregate_profiles(self):
+        """Test profiles are aggregated by URL name with folded stacks"""
+        with self.profiling(SAMPLE_RATE=1):
+            self.client.get(reverse("core:api_tasks"))
+            self.client.get(reverse("core:api_tasks"))
+            self.client.get(reverse("core:api_stats"))
+        # Make sure there is at least one stack to merge
+        profile_path = next(self.directory.glob("*.json"))
+        profile = json.loads(profile_path.read_text())
+        profile["stacks"]["main;handler"] = 3
+        profile_path.write_text(json.dumps(profile))
+
+        out = StringIO()
+        output = self.directory / "folded"
+        call_command(
+            "aggregate_profiles",
+            directory=str(self.directory),
+            output=str(output),
+            stdout=out,
+        )
+        self.assertIn("core:api_tasks: 2 profiles", out.getvalue())
+        self.assertIn("core:api_stats: 1 profiles", out.getvalue())
+        folded = "".join(path.read_text() for path in output.glob("*.folded"))
+        self.assertIn("main;handler 3\n", folded)
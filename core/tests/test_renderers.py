@@ -0,0 +1,81 @@
+import datetime
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.urls import reverse
+
+import msgpack
+import orjson
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from ..models import Task, User
+from ..renderers import MessagePackRenderer, ORJSONRenderer
+
+User = get_user_model()
+
+
+class RendererTest(APITestCase):
+    """Test cases for the orjson and MessagePack renderers/parsers"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username="testuser", email="test@example.com", password="testpass123"
+        )
+        self.task = Task.objects.create(
+            title="Test Task", description="Test description", created_by=self.user
+        )
+        self.client.force_authenticate(user=self.user)
+
+    def test_json_is_default(self):
+        """Test JSON is rendered when no Accept header is sent"""
+        response = self.client.get(reverse("core:api_tasks"))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response["Content-Type"], "application/json")
+        body = orjson.loads(response.content)
+        self.assertEqual(body["results"][0]["title"], "Test Task")
+
+    def test_msgpack_by_accept_header(self):
+        """Test MessagePack is selected by the Accept header"""
+        response = self.client.get(
+            reverse("core:api_tasks"), HTTP_ACCEPT="application/msgpack"
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response["Content-Type"], "application/msgpack")
+        body = msgpack.unpackb(response.content, raw=False)
+        self.assertEqual(body["results"][0]["title"], "Test Task")
+        self.assertEqual(body["results"][0]["created_by"]["username"], "testuser")
+
+    def test_msgpack_request_body(self):
+        """Test creating a task with a MessagePack request body"""
+        data = {"title": "Packed Task", "description": "", "completed": True}
+        response = self.client.post(reverse("core:api_tasks"), data, format="msgpack")
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertTrue(Task.objects.get(title="Packed Task").completed)
+
+    def test_invalid_json_body(self):
+        """Test malformed JSON returns 400"""
+        response = self.client.post(
+            reverse("core:api_tasks"), b"{not json", content_type="application/json"
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_renderers_encode_datetimes(self):
+        """Test raw datetimes are encoded by both renderers"""
+        moment = datetime.datetime(2025, 1, 2, 3, 4, 5, tzinfo=datetime.timezone.utc)
+        self.assertEqual(
+            orjson.loads(ORJSONRenderer().render({"at": moment}))["at"],
+            "2025-01-02T03:04:05+00:00",
+        )
+        self.assertEqual(
+            msgpack.unpackb(MessagePackRenderer().render({"at": moment}))["at"],
+            "2025-01-02T03:04:05Z",
+        )
+
+    def test_benchmark_command(self):
+        """Test the renderer benchmark command reports every renderer"""
+        out = StringIO()
+        call_command("benchmark_renderers", rows=5, iterations=1, stdout=out)
+        for name in ["JSONRenderer", "ORJSONRenderer", "MessagePackRenderer"]:
+            self.assertIn(name, out.getvalue())
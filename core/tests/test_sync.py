@@ -0,0 +1,116 @@
+from datetime import timedelta
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.test import override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from ..models import Task, TaskTombstone, User
+
+User = get_user_model()
+
+
+@override_settings(TASK_SYNC={"SAFETY_LAG": 0})
+class TaskChangesAPITest(APITestCase):
+    """Test cases for the task delta sync endpoint"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username="testuser", email="test@example.com", password="testpass123"
+        )
+        self.task = Task.objects.create(title="Task 1", created_by=self.user)
+        self.other_task = Task.objects.create(title="Task 2", created_by=self.user)
+        self.client.force_authenticate(user=self.user)
+        self.url = reverse("core:api_task_changes")
+
+    def sync(self, since=None, **params):
+        if since:
+            params["since"] = since
+        response = self.client.get(self.url, params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response.data
+
+    def test_initial_sync_returns_everything(self):
+        """Test a sync without a token returns all tasks"""
+        data = self.sync()
+        self.assertEqual(
+            [task["id"] for task in data["changed"]],
+            [self.task.pk, self.other_task.pk],
+        )
+        self.assertEqual(data["deleted"], [])
+        self.assertFalse(data["has_more"])
+
+    def test_incremental_sync_returns_only_changes(self):
+        """Test only tasks updated after the token are returned"""
+        token = self.sync()["next"]
+        self.assertEqual(self.sync(token)["changed"], [])
+
+        self.task.completed = True
+        self.task.save()
+        data = self.sync(token)
+        self.assertEqual([task["id"] for task in data["changed"]], [self.task.pk])
+        self.assertTrue(data["changed"][0]["completed"])
+
+    def test_delete_records_tombstone(self):
+        """Test deleting through the API is reported as a tombstone"""
+        token = self.sync()["next"]
+        url = reverse("core:api_task_detail", kwargs={"pk": self.task.pk})
+        self.client.delete(url)
+
+        self.assertTrue(TaskTombstone.objects.filter(task_id=self.task.pk).exists())
+        data = self.sync(token)
+        self.assertEqual(data["changed"], [])
+        self.assertEqual(data["deleted"], [self.task.pk])
+        self.assertEqual(self.sync(data["next"])["deleted"], [])
+
+    def test_cascade_delete_records_tombstones(self):
+        """Test tasks removed with their author are reported as deleted"""
+        token = self.sync()["next"]
+        self.user.delete()
+        self.assertEqual(
+            sorted(self.sync(token)["deleted"]), [self.task.pk, self.other_task.pk]
+        )
+
+    def test_limit_pages_through_changes(self):
+        """Test has_more and the token walk through changes in batches"""
+        first = self.sync(limit=1)
+        self.assertEqual(len(first["changed"]), 1)
+        self.assertTrue(first["has_more"])
+
+        second = self.sync(first["next"], limit=1)
+        self.assertEqual(
+            [first["changed"][0]["id"], second["changed"][0]["id"]],
+            [self.task.pk, self.other_task.pk],
+        )
+        self.assertFalse(second["has_more"])
+
+    def test_invalid_token(self):
+        """Test a malformed token returns 400"""
+        response = self.client.get(self.url, {"since": "not-a-token"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    @override_settings(TASK_SYNC={"SAFETY_LAG": 60})
+    def test_late_commit_behind_token_is_not_skipped(self):
+        """Test a write committed after a newer one still reaches the client"""
+        now = timezone.now()
+        Task.objects.update(updated_at=now - timedelta(seconds=120))
+        newer = Task.objects.create(title="Newer", created_by=self.user)
+        token_data = self.sync()
+        self.assertEqual(
+            [task["id"] for task in token_data["changed"]],
+            [self.task.pk, self.other_task.pk],
+        )
+
+        # Stamped before `newer` but committed after the token was issued
+        late = Task.objects.create(title="Late", created_by=self.user)
+        Task.objects.filter(pk=late.pk).update(updated_at=now - timedelta(seconds=30))
+
+        with mock.patch(
+            "core.sync.timezone.now", return_value=now + timedelta(seconds=61)
+        ):
+            data = self.sync(token_data["next"])
+        self.assertEqual([task["id"] for task in data["changed"]], [late.pk, newer.pk])
@@ -0,0 +1,155 @@
+import json
+import shutil
+import tempfile
+from io import StringIO
+from pathlib import Path
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import check_password
+from django.core.management import call_command
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from ..models import User
+from ..user_import import api_max_rows, hash_passwords, import_users, parse_rows
+
+User = get_user_model()
+
+CSV = """username,email,password,first_name,age
+alice,alice@example.com,alicepass123,Alice,30
+bob,not-an-email,bobpass123,,
+carol,carol@example.com,short,,
+testuser,new@example.com,testpass123,,
+dave,alice@example.com,davepass123,,
+erin,erin@example.com,erinpass123,,
+"""
+
+
+@override_settings(PASSWORD_HASHERS=["django.contrib.auth.hashers.MD5PasswordHasher"])
+class UserImportTest(APITestCase):
+    """Test cases for bulk user import"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username="testuser", email="test@example.com", password="testpass123"
+        )
+        self.admin_user = User.objects.create_superuser(
+            username="admin", email="admin@example.com", password="adminpass123"
+        )
+        self.url = reverse("core:api_user_import")
+
+    def test_csv_import_reports_errors_per_row(self):
+        """Test valid rows are created and invalid rows are reported"""
+        self.client.force_authenticate(user=self.admin_user)
+        response = self.client.post(
+            self.url, CSV, content_type="text/csv; charset=utf-8"
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data["created"], 2)
+        errors = {error["row"]: error["errors"] for error in response.data["errors"]}
+        self.assertEqual(sorted(errors), [2, 3, 4, 5])
+        self.assertIn("email", errors[2])
+        self.assertIn("password", errors[3])
+        self.assertEqual(list(errors[4]), ["username"])
+        self.assertEqual(list(errors[5]), ["email"])
+
+        alice = User.objects.get(username="alice")
+        self.assertEqual(alice.age, 30)
+        self.assertTrue(check_password("alicepass123", alice.password))
+
+    def test_ndjson_import(self):
+        """Test NDJSON bodies, including malformed lines"""
+        self.client.force_authenticate(user=self.admin_user)
+        body = "\n".join(
+            [
+                json.dumps(
+                    {"username": "frank", "email": "f@example.com", "password": "x" * 8}
+                ),
+                "{broken",
+                "[1, 2]",
+            ]
+        )
+        response = self.client.post(self.url, body, content_type="application/x-ndjson")
+        self.assertEqual(response.data["created"], 1)
+        self.assertEqual([error["row"] for error in response.data["errors"]], [2, 3])
+
+    def test_excel_csv_with_bom(self):
+        """Test a UTF-8 byte order mark before the header is ignored"""
+        self.client.force_authenticate(user=self.admin_user)
+        response = self.client.post(self.url, "\ufeff" + CSV, content_type="text/csv")
+        self.assertEqual(response.data["created"], 2)
+
+    def test_non_utf8_body(self):
+        """Test bodies in another encoding are a parse error"""
+        self.client.force_authenticate(user=self.admin_user)
+        response = self.client.post(
+            self.url,
+            "username,email,password\nzoë,z@example.com,zoepass123\n".encode("latin-1"),
+            content_type="text/csv",
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    @override_settings(USER_IMPORT={"API_HASH_WORKERS": 1, "API_TIME_BUDGET": 5})
+    def test_row_limit(self):
+        """Test bodies that would hash past the time budget are rejected"""
+        self.client.force_authenticate(user=self.admin_user)
+        with mock.patch("core.user_import.password_hash_seconds", return_value=1.0):
+            self.assertEqual(api_max_rows(), 5)
+            response = self.client.post(self.url, CSV, content_type="text/csv")
+        self.assertEqual(response.status_code, status.HTTP_413_REQUEST_ENTITY_TOO_LARGE)
+        self.assertFalse(User.objects.filter(username="alice").exists())
+
+    @override_settings(USER_IMPORT={"API_HASH_WORKERS": 1})
+    def test_api_pool_is_capped(self):
+        """Test the endpoint hashes on at most API_HASH_WORKERS processes"""
+        self.client.force_authenticate(user=self.admin_user)
+        with mock.patch("core.user_import.hash_passwords", return_value=[]) as hash_:
+            self.client.post(self.url, CSV, content_type="text/csv")
+        self.assertEqual(hash_.call_args.args[1], 1)
+
+    def test_uniqueness_checked_in_one_query(self):
+        """Test uniqueness is one set-based query regardless of row count"""
+        rows = parse_rows(CSV, "csv")
+        with CaptureQueriesContext(connection) as queries:
+            import_users(rows, workers=1)
+        selects = [q["sql"] for q in queries if q["sql"].startswith("SELECT")]
+        inserts = [q["sql"] for q in queries if q["sql"].startswith("INSERT")]
+        self.assertEqual(len(selects), 1)
+        self.assertEqual(len(inserts), 1)
+
+    def test_hash_passwords_in_process_pool(self):
+        """Test passwords hashed by pool workers verify in the parent"""
+        passwords = [f"password{i}" for i in range(4)]
+        hashed = hash_passwords(passwords, workers=2)
+        for password, encoded in zip(passwords, hashed):
+            self.assertTrue(check_password(password, encoded))
+
+    def test_requires_admin(self):
+        """Test only admins can import users"""
+        self.client.force_authenticate(user=self.user)
+        response = self.client.post(self.url, CSV, content_type="text/csv")
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_unsupported_media_type(self):
+        """Test unknown body formats are rejected"""
+        self.client.force_authenticate(user=self.admin_user)
+        response = self.client.post(self.url, "x", content_type="text/plain")
+        self.assertEqual(response.status_code, status.HTTP_415_UNSUPPORTED_MEDIA_TYPE)
+
+    def test_import_command(self):
+        """Test the management command imports a file"""
+        directory = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, directory)
+        path = directory / "users.csv"
+        path.write_text(CSV)
+
+        out, err = StringIO(), StringIO()
+        call_command("import_users", str(path), workers=1, stdout=out, stderr=err)
+        self.assertIn("Created 2 users", out.getvalue())
+        self.assertIn("Row 2:", err.getvalue())
@@ -0,0 +1,97 @@
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+from django.utils import timezone
+
+from rest_framework import serializers
+from rest_framework.test import APITestCase
+
+from ..models import ArchivedTask, Task, User
+
+User = get_user_model()
+
+
+class UserTaskStatsTest(APITestCase):
+    """Test cases for task stats on the user list"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username="testuser", email="test@example.com", password="testpass123"
+        )
+        self.idle_user = User.objects.create_user(
+            username="idle", email="idle@example.com", password="testpass123"
+        )
+        for i in range(7):
+            Task.objects.create(
+                title=f"Task {i}", completed=i < 2, created_by=self.user
+            )
+        now = timezone.now()
+        ArchivedTask.objects.create(
+            id=1000,
+            title="Archived",
+            created_by=self.user,
+            created_at=now - timedelta(days=400),
+            updated_at=now - timedelta(days=300),
+        )
+        self.client.force_authenticate(user=self.user)
+        self.url = reverse("core:api_users")
+
+    def users_by_name(self, response):
+        return {user["username"]: user for user in response.data["results"]}
+
+    def test_default_list_unchanged(self):
+        """Test the plain user list has no stats"""
+        response = self.client.get(self.url)
+        self.assertNotIn("task_stats", response.data["results"][0])
+        self.assertNotIn("recent_tasks", response.data["results"][0])
+
+    def test_task_stats(self):
+        """Test task counts come from the list query itself"""
+        with self.assertNumQueries(2):  # count, page
+            response = self.client.get(self.url, {"include": "task_stats"})
+        users = self.users_by_name(response)
+
+        stats = users["testuser"]["task_stats"]
+        self.assertEqual(stats["total"], 8)
+        self.assertEqual(stats["completed"], 3)
+        self.assertEqual(stats["open"], 5)
+        self.assertIsNotNone(stats["latest_task_at"])
+        self.assertNotIn("recent_tasks", users["testuser"])
+        self.assertEqual(
+            users["idle"]["task_stats"],
+            {"total": 0, "completed": 0, "open": 0, "latest_task_at": None},
+        )
+
+    def test_latest_task_from_archive(self):
+        """Test an archived task newer than every open task is the latest"""
+        now = timezone.now()
+        Task.objects.filter(created_by=self.user).update(
+            created_at=now - timedelta(days=700)
+        )
+        archived = ArchivedTask.objects.create(
+            id=1001,
+            title="Newer archived",
+            created_by=self.user,
+            created_at=now - timedelta(days=200),
+            updated_at=now - timedelta(days=150),
+        )
+        response = self.client.get(self.url, {"include": "task_stats"})
+        stats = self.users_by_name(response)["testuser"]["task_stats"]
+        self.assertEqual(
+            stats["latest_task_at"],
+            serializers.DateTimeField().to_representation(archived.created_at),
+        )
+
+    def test_recent_tasks(self):
+        """Test recent tasks are prefetched for the whole page at once"""
+        with self.assertNumQueries(3):  # count, page, recent tasks
+            response = self.client.get(self.url, {"include": "task_stats,recent_tasks"})
+        users = self.users_by_name(response)
+
+        recent = users["testuser"]["recent_tasks"]
+        self.assertEqual(
+            [task["title"] for task in recent],
+            ["Task 6", "Task 5", "Task 4", "Task 3", "Task 2"],
+        )
+        self.assertEqual(users["idle"]["recent_tasks"], [])
@@ -10,12 +10,23 @@ urlpatterns = [
     path("tasks/", views.tasks_list, name="tasks_list"),
     # API endpoints
     path("api/users/", views.UserListCreateAPIView.as_view(), name="api_users"),
+    path(
+        "api/users/import/", views.UserImportAPIView.as_view(), name="api_user_import"
+    ),
     path(
         "api/users/<int:pk>/", views.UserDetailAPIView.as_view(), name="api_user_detail"
     ),
     path("api/tasks/", views.TaskListCreateAPIView.as_view(), name="api_tasks"),
+    path(
+        "api/tasks/changes/",
+        views.TaskChangesAPIView.as_view(),
+        name="api_task_changes",
+    ),
     path(
         "api/tasks/<int:pk>/", views.TaskDetailAPIView.as_view(), name="api_task_detail"
     ),
     path("api/stats/", views.api_stats, name="api_stats"),
+    path("api/events/", views.task_events, name="api_events"),
+    path("api/cache/stats/", views.api_cache_stats, name="api_cache_stats"),
+    path("api/writes/stats/", views.api_write_stats, name="api_write_stats"),
 ]
@@ -0,0 +1,207 @@
+import csv
+import functools
+import io
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import django
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
+from django.db import IntegrityError, transaction
+from django.db.models import Q
+
+from rest_framework.validators import UniqueValidator
+
+from .cache import get_tiered_cache
+from .models import User
+from .serializers import UserCreateSerializer
+
+FORMATS = {
+    "text/csv": "csv",
+    "application/x-ndjson": "ndjson",
+}
+
+
+class BulkUserCreateSerializer(UserCreateSerializer):
+    """
+    UserCreateSerializer without the per-row uniqueness queries.
+
+    Uniqueness of username and email is checked for the whole import at once
+    by ``import_users``.
+    """
+
+    def get_fields(self):
+        fields = super().get_fields()
+        for field in fields.values():
+            field.validators = [
+                validator
+                for validator in field.validators
+                if not isinstance(validator, UniqueValidator)
+            ]
+        return fields
+
+
+def parse_rows(data, fmt):
+    """
+    Parse CSV or NDJSON ``data`` (text) into a list of ``(row, error)`` pairs.
+
+    ``error`` is set instead of ``row`` for NDJSON lines that are not objects.
+    """
+    if fmt == "csv":
+        return [
+            ({key: value for key, value in row.items() if value != ""}, None)
+            for row in csv.DictReader(io.StringIO(data))
+        ]
+    rows = []
+    for line in data.splitlines():
+        if not line.strip():
+            continue
+        try:
+            row = json.loads(line)
+        except ValueError as exc:
+            rows.append((None, f"Invalid JSON - {exc}"))
+            continue
+        if isinstance(row, dict):
+            rows.append((row, None))
+        else:
+            rows.append((None, "Expected a JSON object."))
+    return rows
+
+
+def _init_hash_worker(settings_module):
+    # Needed under the "spawn"/"forkserver" start methods; a no-op after fork
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", settings_module)
+    django.setup()
+
+
+def hash_passwords(passwords, workers=None):
+    """Hash ``passwords`` in parallel across a pool of processes"""
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(passwords) < 2:
+        return [make_password(password) for password in passwords]
+    with ProcessPoolExecutor(
+        max_workers=min(workers, len(passwords)),
+        initializer=_init_hash_worker,
+        initargs=(os.environ.get("DJANGO_SETTINGS_MODULE", ""),),
+    ) as pool:
+        chunksize = max(1, len(passwords) // (workers * 4))
+        return list(pool.map(make_password, passwords, chunksize=chunksize))
+
+
+@functools.cache
+def _measure_hash(hasher):
+    started = time.perf_counter()
+    make_password("import-benchmark")
+    return time.perf_counter() - started
+
+
+def password_hash_seconds():
+    """Time one ``make_password`` with the current hasher, measured once"""
+    return _measure_hash(settings.PASSWORD_HASHERS[0])
+
+
+def api_hash_workers():
+    """Pool size for imports served over HTTP, capped by API_HASH_WORKERS"""
+    config = getattr(settings, "USER_IMPORT", {})
+    return max(1, min(config.get("API_HASH_WORKERS", 2), os.cpu_count() or 1))
+
+
+def api_max_rows():
+    """Rows whose passwords hash within API_TIME_BUDGET on the API pool"""
+    budget = getattr(settings, "USER_IMPORT", {}).get("API_TIME_BUDGET", 10)
+    return max(1, int(budget * api_hash_workers() / password_hash_seconds()))
+
+
+def import_users(rows, workers=None, batch_size=None):
+    """
+    Validate and create users from parsed ``rows``.
+
+    Returns ``{"created": n, "errors": [{"row": i, "errors": {...}}]}`` with
+    1-based row numbers. Valid rows are created even if others fail.
+    """
+    config = getattr(settings, "USER_IMPORT", {})
+    workers = workers or config.get("HASH_WORKERS")
+    batch_size = batch_size or config.get("BATCH_SIZE", 500)
+
+    errors = []
+    valid = []
+    for number, (row, error) in enumerate(rows, start=1):
+        if error:
+            errors.append({"row": number, "errors": {"non_field_errors": [error]}})
+            continue
+        serializer = BulkUserCreateSerializer(data=row)
+        if serializer.is_valid():
+            data = dict(serializer.validated_data)
+            data["username"] = User.normalize_username(data["username"])
+            data["email"] = User.objects.normalize_email(data["email"])
+            valid.append((number, data))
+        else:
+            row_errors = {
+                field: [str(message) for message in messages]
+                for field, messages in serializer.errors.items()
+            }
+            errors.append({"row": number, "errors": row_errors})
+
+    valid = _drop_duplicates(valid, errors)
+    errors.sort(key=lambda error: error["row"])
+    if not valid:
+        return {"created": 0, "errors": errors}
+
+    hashed = hash_passwords([data.pop("password") for _, data in valid], workers)
+    users = [
+        User(**data, password=password) for (_, data), password in zip(valid, hashed)
+    ]
+    try:
+        with transaction.atomic():
+            User.objects.bulk_create(users, batch_size=batch_size)
+    except IntegrityError:
+        # Another request created one of these users after the check
+        for number, _ in valid:
+            errors.append(
+                {
+                    "row": number,
+                    "errors": {
+                        "non_field_errors": [
+                            "A conflicting user was created concurrently; retry."
+                        ]
+                    },
+                }
+            )
+        errors.sort(key=lambda error: error["row"])
+        return {"created": 0, "errors": errors}
+
+    # bulk_create sends no post_save signals
+    get_tiered_cache().invalidate("counts")
+    return {"created": len(users), "errors": errors}
+
+
+def _drop_duplicates(valid, errors):
+    """Reject rows whose username or email exists or repeats in the import"""
+    usernames = [data["username"] for _, data in valid]
+    emails = [data["email"] for _, data in valid]
+    existing = list(
+        User.objects.filter(
+            Q(username__in=usernames) | Q(email__in=emails)
+        ).values_list("username", "email")
+    )
+    taken = {
+        "username": {username for username, _ in existing},
+        "email": {email for _, email in existing},
+    }
+
+    kept = []
+    for number, data in valid:
+        row_errors = {
+            field: [f"A user with that {field} already exists."]
+            for field in ("username", "email")
+            if data[field] in taken[field]
+        }
+        if row_errors:
+            errors.append({"row": number, "errors": row_errors})
+            continue
+        taken["username"].add(data["username"])
+        taken["email"].add(data["email"])
+        kept.append((number, data))
+    return kept
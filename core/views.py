@@ -1,26 +1,85 @@
+import functools
+from datetime import datetime, timezone
+
+from django.conf import settings
+from django.core.handlers.asgi import ASGIRequest
+from django.db.models import (
+    Count,
+    DateTimeField,
+    Max,
+    OuterRef,
+    Prefetch,
+    Q,
+    Subquery,
+    Value,
+)
+from django.db.models.functions import Coalesce, Greatest, NullIf
+from django.http import JsonResponse, StreamingHttpResponse
 from django.shortcuts import render
+from django.utils.http import parse_etags
+from django.views.decorators.http import require_GET
 
+from asgiref.sync import sync_to_async
 from rest_framework import generics, permissions, status
 from rest_framework.decorators import api_view, permission_classes
+from rest_framework.exceptions import (
+    AuthenticationFailed,
+    NotFound,
+    ParseError,
+    UnsupportedMediaType,
+)
 from rest_framework.permissions import AllowAny
+from rest_framework.request import Request
 from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.views import APIView
 
-from .models import Task, User
+from . import coalescing
+from .archive import load_tasks, tasks_with_archived
+from .cache import get_tiered_cache
+from .events import event_stream
+from .exceptions import PayloadTooLarge, PreconditionFailed, WriteTimeout
+from .models import ArchivedTask, Task, User
 from .serializers import (
     TaskCreateUpdateSerializer,
     TaskSerializer,
+    TaskWithArchivedSerializer,
     UserCreateSerializer,
     UserSerializer,
+    UserWithTaskStatsSerializer,
 )
+from .sync import get_changes
+from .user_import import (
+    FORMATS,
+    api_hash_workers,
+    api_max_rows,
+    import_users,
+    parse_rows,
+)
+
+
+def get_counts():
+    """Site-wide user and task counts, served from the tiered cache"""
+    return get_tiered_cache().get_or_set(
+        "counts",
+        "all",
+        lambda: {
+            "total_users": User.objects.count(),
+            "total_tasks": Task.objects.count() + ArchivedTask.objects.count(),
+            "completed_tasks": Task.objects.filter(completed=True).count()
+            + ArchivedTask.objects.filter(completed=True).count(),
+        },
+    )
 
 
 # Traditional Django Views
 def home(request):
     """Simple home page view"""
+    counts = get_counts()
     context = {
         "title": "Django API Boilerplate",
-        "users_count": User.objects.count(),
-        "tasks_count": Task.objects.count(),
+        "users_count": counts["total_users"],
+        "tasks_count": counts["total_tasks"],
     }
     return render(request, "core/home.html", context)
 
@@ -34,21 +93,117 @@ def tasks_list(request):
 
 # API Views
 class UserListCreateAPIView(generics.ListCreateAPIView):
-    """List all users or create a new user"""
+    """List all users or create a new user
+
+    ``?include=task_stats`` adds per-user task counts computed in the list
+    query; ``?include=recent_tasks`` adds each user's latest tasks, fetched
+    for the whole page in one extra query.
+    """
 
     queryset = User.objects.all()
+    recent_tasks_limit = 5
+
+    def get_include(self):
+        return set(
+            filter(None, self.request.query_params.get("include", "").split(","))
+        )
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        include = self.get_include()
+        if "task_stats" in include:
+            archived = (
+                ArchivedTask.objects.filter(created_by=OuterRef("pk"))
+                .order_by()
+                .values("created_by")
+            )
+            floor = Value(
+                datetime(1970, 1, 1, tzinfo=timezone.utc),
+                output_field=DateTimeField(),
+            )
+            archived_count = Coalesce(
+                Subquery(archived.annotate(count=Count("pk")).values("count")), 0
+            )
+            queryset = queryset.annotate(
+                total_tasks=Count("tasks") + archived_count,
+                completed_tasks=Count("tasks", filter=Q(tasks__completed=True))
+                + archived_count,
+                # Archived tasks can be newer than open ones, so take the later
+                # of both; the floor keeps a missing side from winning (SQLite's
+                # multi-argument MAX returns NULL if any argument is NULL).
+                latest_task_at=NullIf(
+                    Greatest(
+                        Coalesce(Max("tasks__created_at"), floor),
+                        Coalesce(
+                            Subquery(
+                                archived.annotate(latest=Max("created_at")).values(
+                                    "latest"
+                                )
+                            ),
+                            floor,
+                        ),
+                    ),
+                    floor,
+                ),
+            )
+        if "recent_tasks" in include:
+            recent = Task.objects.order_by("-created_at")[: self.recent_tasks_limit]
+            queryset = queryset.prefetch_related(
+                Prefetch("tasks", queryset=recent, to_attr="recent_tasks")
+            )
+        return queryset
 
     def get_serializer_class(self):
         if self.request.method == "POST":
             return UserCreateSerializer
+        if self.get_include() & {"task_stats", "recent_tasks"}:
+            return UserWithTaskStatsSerializer
         return UserSerializer
 
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        context["include"] = self.get_include()
+        return context
+
     def get_permissions(self):
         if self.request.method == "POST":
             return [AllowAny()]
         return [permissions.IsAuthenticated()]
 
 
+class UserImportAPIView(APIView):
+    """Create users in bulk from a CSV or NDJSON request body"""
+
+    permission_classes = [permissions.IsAdminUser]
+
+    def post(self, request):
+        fmt = FORMATS.get(request.content_type.split(";")[0].strip())
+        if fmt is None:
+            raise UnsupportedMediaType(request.content_type)
+        try:
+            # utf-8-sig drops the byte order mark Excel puts before the header
+            data = request.body.decode("utf-8-sig")
+        except UnicodeDecodeError as exc:
+            raise ParseError(f"Body must be UTF-8 encoded - {exc}")
+        rows = parse_rows(data, fmt)
+        # Hashing blocks this worker, so keep it within the time budget
+        max_rows = api_max_rows()
+        if len(rows) > max_rows:
+            raise PayloadTooLarge(
+                f"At most {max_rows} rows per request; "
+                "use `manage.py import_users` for larger files."
+            )
+        result = import_users(rows, workers=api_hash_workers())
+        return Response(
+            result,
+            status=(
+                status.HTTP_201_CREATED
+                if result["created"]
+                else status.HTTP_400_BAD_REQUEST
+            ),
+        )
+
+
 class UserDetailAPIView(generics.RetrieveUpdateDestroyAPIView):
     """Retrieve, update or delete a user"""
 
@@ -56,6 +211,14 @@ class UserDetailAPIView(generics.RetrieveUpdateDestroyAPIView):
     serializer_class = UserSerializer
     permission_classes = [permissions.IsAuthenticated]
 
+    def retrieve(self, request, *args, **kwargs):
+        data = get_tiered_cache().get_or_set(
+            f"user:{self.kwargs[self.lookup_field]}",
+            "detail",
+            lambda: self.get_serializer(self.get_object()).data,
+        )
+        return Response(data)
+
 
 class TaskListCreateAPIView(generics.ListCreateAPIView):
     """List all tasks or create a new task"""
@@ -74,27 +237,212 @@ class TaskListCreateAPIView(generics.ListCreateAPIView):
     def perform_create(self, serializer):
         serializer.save(created_by=self.request.user)
 
+    def list(self, request, *args, **kwargs):
+        if request.query_params.get("include_archived") not in ("true", "1"):
+            return super().list(request, *args, **kwargs)
+
+        rows = tasks_with_archived()
+        page = self.paginate_queryset(rows)
+        serializer = TaskWithArchivedSerializer(
+            load_tasks(rows if page is None else page),
+            many=True,
+            context=self.get_serializer_context(),
+        )
+        if page is None:
+            return Response(serializer.data)
+        return self.get_paginated_response(serializer.data)
+
 
 class TaskDetailAPIView(generics.RetrieveUpdateDestroyAPIView):
-    """Retrieve, update or delete a task"""
+    """Retrieve, update or delete a task
+
+    Responses carry the task version as an ETag; sending it back in
+    ``If-Match`` makes the write fail with 412 if the task changed meanwhile.
+    """
 
     queryset = Task.objects.select_related("created_by").all()
     permission_classes = [permissions.IsAuthenticated]
+    # Fields a PATCH may toggle with a single conditional UPDATE
+    toggle_fields = {"completed"}
 
     def get_serializer_class(self):
         if self.request.method in ["PUT", "PATCH"]:
             return TaskCreateUpdateSerializer
         return TaskSerializer
 
+    def get_if_match_version(self):
+        """Return the version sent in If-Match, or None if there is none"""
+        etags = parse_etags(self.request.headers.get("If-Match", ""))
+        if not etags or etags == ["*"]:
+            return None
+        try:
+            return int(etags[0].removeprefix("W/").strip('"'))
+        except ValueError:
+            raise PreconditionFailed()
+
+    def with_etag(self, response, version):
+        response["ETag"] = f'"{version}"'
+        return response
+
+    def retrieve(self, request, *args, **kwargs):
+        cache = get_tiered_cache()
+        namespace = f"task:{self.kwargs[self.lookup_field]}"
+        get_object = functools.cache(self.get_object)
+        # The detail embeds its author, so key it by the author's version too:
+        # one bump of the user namespace then covers all of their tasks.
+        author_id = cache.get_or_set(
+            namespace, "author", lambda: get_object().created_by_id
+        )
+        data = cache.get_or_set(
+            namespace,
+            f"detail:{cache.get_version(f'user:{author_id}')}",
+            lambda: self.get_serializer(get_object()).data,
+        )
+        return self.with_etag(Response(data), data["version"])
+
+    def update(self, request, *args, **kwargs):
+        version = self.get_if_match_version()
+        if (
+            version is not None
+            and request.method == "PATCH"
+            and isinstance(request.data, dict)
+            and request.data
+            and set(request.data) <= self.toggle_fields
+        ):
+            return self.toggle(version)
+
+        partial = kwargs.pop("partial", False)
+        instance = self.get_object()
+        if version is not None and version != instance.version:
+            raise PreconditionFailed()
+        serializer = self.get_serializer(instance, data=request.data, partial=partial)
+        serializer.is_valid(raise_exception=True)
+        self.perform_update(serializer)
+        return self.with_etag(Response(serializer.data), instance.version)
+
+    def toggle(self, version):
+        """Apply a toggle-only PATCH without reading the task first
+
+        The response body holds only the fields that were written.
+        """
+        serializer = self.get_serializer(data=self.request.data, partial=True)
+        serializer.is_valid(raise_exception=True)
+        pk = self.kwargs[self.lookup_field]
+        values = serializer.validated_data
+        # Under ASGI, sync views run on one shared thread, so no batch could
+        # form and waiting for the flush would only stall that thread.
+        if (
+            set(values) == {"completed"}
+            and settings.WRITE_COALESCING["ENABLED"]
+            and not isinstance(self.request._request, ASGIRequest)
+        ):
+            return self.toggle_write_behind(pk, version, values)
+        # Only match rows the toggle actually changes, so no-op toggles do not
+        # bump the version and change events are exact.
+        new_version = Task.objects.exclude(**values).update_versioned(
+            pk, version, **values
+        )
+        if new_version is None:
+            current = Task.objects.filter(pk=pk).values("version", *values).first()
+            if current is None:
+                raise NotFound()
+            if current.pop("version") != version or current != values:
+                raise PreconditionFailed()
+            new_version = version
+        return self.with_etag(Response(values), new_version)
+
+    def toggle_write_behind(self, pk, version, values):
+        """Hand the toggle to the batching coalescer and wait for its flush"""
+        outcome, new_version = coalescing.get_coalescer().submit(
+            pk, version, values["completed"]
+        )
+        if outcome == coalescing.MISSING:
+            raise NotFound()
+        if outcome == coalescing.CONFLICT:
+            raise PreconditionFailed()
+        if outcome == coalescing.DROPPED:
+            raise WriteTimeout()
+        if outcome == coalescing.PENDING:
+            raise WriteTimeout(
+                "The change is still being written; re-read the task before retrying."
+            )
+        return self.with_etag(Response(values), new_version)
+
+
+class TaskChangesAPIView(generics.GenericAPIView):
+    """Return tasks created, updated or deleted since a sync token"""
+
+    serializer_class = TaskSerializer
+    permission_classes = [permissions.IsAuthenticated]
+    default_limit = 100
+    max_limit = 1000
+
+    def get_limit(self):
+        try:
+            limit = int(self.request.query_params["limit"])
+        except (KeyError, ValueError):
+            return self.default_limit
+        return max(1, min(limit, self.max_limit))
+
+    def get(self, request):
+        changes = get_changes(request.query_params.get("since"), self.get_limit())
+        serializer = self.get_serializer(changes.pop("tasks"), many=True)
+        return Response({"changed": serializer.data, **changes})
+
 
 @api_view(["GET"])
 @permission_classes([permissions.IsAuthenticated])
 def api_stats(request):
     """Get API statistics"""
-    stats = {
-        "total_users": User.objects.count(),
-        "total_tasks": Task.objects.count(),
-        "completed_tasks": Task.objects.filter(completed=True).count(),
-        "current_user": request.user.username,
-    }
+    stats = {**get_counts(), "current_user": request.user.username}
     return Response(stats)
+
+
+@api_view(["GET"])
+@permission_classes([permissions.IsAdminUser])
+def api_cache_stats(request):
+    """Get hit/miss counts of this process's cache tiers"""
+    return Response(get_tiered_cache().stats)
+
+
+@api_view(["GET"])
+@permission_classes([permissions.IsAdminUser])
+def api_write_stats(request):
+    """Get flush size and latency of this process's toggle coalescer"""
+    stats = dict(coalescing.get_coalescer().stats)
+    flushes = stats["flushes"] or 1
+    stats["avg_flush_size"] = stats["toggles"] / flushes
+    stats["avg_flush_ms"] = stats["total_flush_ms"] / flushes
+    return Response(stats)
+
+
+def _authenticate(request):
+    """Authenticate a plain Django request with the API's authenticators"""
+    drf_request = Request(
+        request,
+        authenticators=[auth() for auth in api_settings.DEFAULT_AUTHENTICATION_CLASSES],
+    )
+    try:
+        return drf_request.user
+    except AuthenticationFailed:
+        return None
+
+
+@require_GET
+async def task_events(request):
+    """Stream task changes and stats deltas as Server-Sent Events"""
+    # Under WSGI, Django consumes an async stream fully before sending it,
+    # which for this endless stream would tie up the worker until it is killed.
+    if not isinstance(request, ASGIRequest):
+        return JsonResponse(
+            {"detail": "Event stream requires an ASGI server."}, status=501
+        )
+    user = await sync_to_async(_authenticate)(request)
+    if user is None or not user.is_authenticated:
+        return JsonResponse(
+            {"detail": "Authentication credentials were not provided."}, status=403
+        )
+    response = StreamingHttpResponse(event_stream(), content_type="text/event-stream")
+    response["Cache-Control"] = "no-cache"
+    response["X-Accel-Buffering"] = "no"
+    return response
@@ -2,6 +2,8 @@
 ASGI config for django_api_boilerplate project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
+Serve it with an ASGI server for the Server-Sent Events stream at /api/events/,
+which holds its connection open without tying up a worker thread.
 
 For more information on this file, see
 https://docs.djangoproject.com/en/5.2/howto/deployment/asgi/
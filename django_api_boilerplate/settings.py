@@ -42,7 +42,11 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    "core.middleware.HealthCheckMiddleware",
+    "core.profiling.ProfilingMiddleware",
     "django.middleware.security.SecurityMiddleware",
+    "whitenoise.middleware.WhiteNoiseMiddleware",
+    "core.middleware.CompressionMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
@@ -82,6 +86,30 @@ DATABASES = {
 }
 
 
+# Cache
+# https://docs.djangoproject.com/en/5.2/topics/cache/
+# locmem is private to each process; share one cache between workers with e.g.
+#   "BACKEND": "django.core.cache.backends.redis.RedisCache",
+#   "LOCATION": "redis://localhost:6379/1",
+
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "django-api-boilerplate",
+    }
+}
+
+# Per-process LRU in front of CACHES[ALIAS] (core.cache.TieredCache). Entries
+# are held locally for LOCAL_TTL seconds, which bounds how stale other
+# processes may be after an invalidation.
+TIERED_CACHE = {
+    "ALIAS": "default",
+    "MAX_ENTRIES": 1000,
+    "LOCAL_TTL": 2,
+    "TIMEOUT": 300,
+}
+
+
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
 
@@ -119,11 +147,88 @@ USE_TZ = True
 STATIC_URL = "static/"
 STATIC_ROOT = BASE_DIR / "staticfiles"
 
+# collectstatic writes hashed, gzip/brotli precompressed copies; whitenoise
+# serves the hashed names with far-future, immutable cache headers.
+STORAGES = {
+    "default": {
+        "BACKEND": "django.core.files.storage.FileSystemStorage",
+    },
+    "staticfiles": {
+        "BACKEND": "whitenoise.storage.CompressedManifestStaticFilesStorage",
+    },
+}
+
+# Delta sync (core.sync). Changes are only returned once they are SAFETY_LAG
+# seconds old, so writes committing out of timestamp order are not skipped;
+# keep it above the longest transaction that writes tasks.
+TASK_SYNC = {
+    "SAFETY_LAG": 5,
+}
+
+# Response compression (core.middleware.CompressionMiddleware)
+COMPRESSION_MIN_SIZE = 1024
+COMPRESSION_BROTLI_QUALITY = 5
+
+# Answered by core.middleware.HealthCheckMiddleware without touching the ORM
+HEALTHCHECK_PATH = "/healthz"
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.2/ref/settings/#default-auto-field
 
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
+# Task change events pushed to /api/events/ (core.events). LocalBroker only
+# reaches clients connected to the same process; use core.events.RedisBroker,
+# e.g. OPTIONS={"url": "redis://localhost:6379/0"}, to share across workers.
+TASK_EVENTS = {
+    "BACKEND": "core.events.LocalBroker",
+    "OPTIONS": {},
+    "HEARTBEAT": 15,
+}
+
+# Bulk user import (core.user_import). `manage.py import_users` hashes passwords
+# on HASH_WORKERS processes (None = one per CPU) with no row limit. The API
+# endpoint uses at most API_HASH_WORKERS processes per request and accepts only
+# as many rows as hash in API_TIME_BUDGET seconds, from the measured cost of one
+# hash; keep the budget well below GUNICORN_TIMEOUT.
+USER_IMPORT = {
+    "HASH_WORKERS": None,
+    "API_HASH_WORKERS": 2,
+    "API_TIME_BUDGET": 10,
+    "BATCH_SIZE": 500,
+}
+
+# `manage.py archive_tasks` moves tasks completed and untouched for AFTER_DAYS
+# into core_archivedtask, BATCH_SIZE rows per transaction.
+TASK_ARCHIVE = {
+    "AFTER_DAYS": 90,
+    "BATCH_SIZE": 1000,
+}
+
+# Write-behind batching of `completed` toggles (core.coalescing). Toggle PATCHes
+# sent with If-Match wait up to WINDOW_MS to be flushed together in one UPDATE
+# by a background thread. Useless under the default uvicorn workers, which
+# bypass it and write toggles directly; only batches with gthread workers
+# (GUNICORN_THREADS), while sync workers just add WINDOW_MS to each toggle.
+# Toggles still queued after TIMEOUT seconds are discarded and answered with 503.
+WRITE_COALESCING = {
+    "ENABLED": False,
+    "WINDOW_MS": 5,
+    "MAX_BATCH": 500,
+    "TIMEOUT": 5,
+}
+
+# Request profiling (core.profiling.ProfilingMiddleware). When enabled, stores
+# collapsed stacks and SQL for SAMPLE_RATE of requests and for every request
+# slower than SLOW_THRESHOLD_MS; summarise with `manage.py aggregate_profiles`.
+PROFILING = {
+    "ENABLED": False,
+    "SAMPLE_RATE": 0.01,
+    "SLOW_THRESHOLD_MS": 500,
+    "INTERVAL": 0.005,
+    "DIRECTORY": BASE_DIR / "profiles",
+}
+
 # Custom User Model
 AUTH_USER_MODEL = "core.User"
 
@@ -138,5 +243,23 @@ REST_FRAMEWORK = {
     ],
     "DEFAULT_PAGINATION_CLASS": "rest_framework.pagination.PageNumberPagination",
     "PAGE_SIZE": 20,
+    # orjson is served for `Accept: application/json`, MessagePack for
+    # `Accept: application/msgpack`
+    "DEFAULT_RENDERER_CLASSES": [
+        "core.renderers.ORJSONRenderer",
+        "core.renderers.MessagePackRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ],
+    "DEFAULT_PARSER_CLASSES": [
+        "core.parsers.ORJSONParser",
+        "core.parsers.MessagePackParser",
+        "rest_framework.parsers.FormParser",
+        "rest_framework.parsers.MultiPartParser",
+    ],
+    "TEST_REQUEST_RENDERER_CLASSES": [
+        "rest_framework.renderers.MultiPartRenderer",
+        "rest_framework.renderers.JSONRenderer",
+        "core.renderers.MessagePackRenderer",
+    ],
     "TEST_REQUEST_DEFAULT_FORMAT": "json",
 }